@@ -0,0 +1,59 @@
+from collections import OrderedDict
+from sdl.algorithm.partition.io import site_makespan
+from sdl.algorithm.scheduling.io import ScheduleResult
+from sdl.lab import Job, SDLLab
+from typing import Callable, Hashable, Optional
+
+CacheKey = tuple[int, frozenset, Callable]
+
+
+class ScheduleCache:
+    """Bounded LRU cache of single-site makespans keyed by (site id, job ids, scheduler). The
+    scheduler object itself is part of the key, so lambdas or partials that share a name never
+    share entries, and the key keeps it alive. Site ids are positions in the `sites` list, so one
+    cache must only be shared between calls on the same list of sites."""
+
+    def __init__(self, maxsize: Optional[int] = 100_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, int] = OrderedDict()
+
+    @staticmethod
+    def key(scheduler: Callable, site_id: int, jobs: list[Job]) -> CacheKey:
+        return site_id, frozenset(job.idx for job in jobs), scheduler
+
+    def get(self, key: CacheKey) -> Optional[int]:
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: CacheKey, makespan: int):
+        self._data[key] = makespan
+        self._data.move_to_end(key)
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def makespan(self, scheduler: Callable[[SDLLab, list[Job]], ScheduleResult], site_id: int, site: SDLLab,
+                 jobs: list[Job]) -> int:
+        key = self.key(scheduler, site_id, jobs)
+        makespan = self.get(key)
+        if makespan is None:
+            makespan = site_makespan(scheduler, site, jobs)
+            self.put(key, makespan)
+        return makespan
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data), 'maxsize': self.maxsize}
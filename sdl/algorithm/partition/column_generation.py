@@ -0,0 +1,160 @@
+from pulp import *
+from sdl.algorithm.partition.cache import ScheduleCache
+from sdl.algorithm.partition.evaluate import SiteEvaluator
+from sdl.algorithm.partition.feasibility import capable_sites, feasibility_matrix
+from sdl.algorithm.partition.io import PartitionDecisions, validate_partitions
+from sdl.algorithm.scheduling.io import ScheduleResult
+from sdl.lab import Job, SDLLab
+from time import perf_counter
+from typing import Callable, Optional
+
+
+def _greedy_assignment(sites: list[SDLLab], jobs: list[Job], capable: dict[int, list[int]],
+                       work: dict[tuple[int, int], int]) -> dict[int, list[int]]:
+    """Assign every job, longest first, to the capable site with the least work so far."""
+    load = {i: 0 for i in range(len(sites))}
+    assignment = {i: [] for i in range(len(sites))}
+    for e in sorted(range(len(jobs)), key=lambda e: -max(work[i, e] for i in capable[e])):
+        i = min(capable[e], key=lambda i: (load[i] + work[i, e], i))
+        load[i] += work[i, e]
+        assignment[i].append(e)
+    return assignment
+
+
+def column_generation_partition(
+        sites: list[SDLLab],
+        jobs: list[Job],
+        scheduler: Callable[[SDLLab, list[Job]], ScheduleResult],
+        msg: bool = False,
+        time_limit: Optional[int] = None,
+        max_iterations: int = 100,
+        patience: int = 3,
+        cache: Optional[ScheduleCache] = None,
+        n_workers: int = 1
+) -> PartitionDecisions:
+    """
+    Partitions the jobs with a set-partitioning master problem over columns (site, job subset,
+    makespan). The LP relaxation of
+
+        min C  s.t.  sum_{c covers e} lambda_c = 1       for every job e       (dual pi_e)
+                     sum_{c at site i} lambda_c <= 1      for every site i      (dual mu_i)
+                     C >= sum_{c at site i} T_c lambda_c  for every site i      (dual sigma_i)
+
+    is solved repeatedly; the pricing heuristic grows job subsets per site in decreasing order of
+    pi_e per unit of work, schedules each prefix with `scheduler` and adds the prefixes with
+    negative reduced cost -sum pi_e - mu_i + sigma_i T. A rounded partition of every LP solution
+    is added as well so that the integer master always has good complete partitions. Once no
+    column prices out (or after `max_iterations`), the master is solved with integer lambda over
+    the generated columns. With `n_workers > 1` the initial and rounded partitions are scheduled
+    in parallel over the sites.
+    """
+    start = perf_counter()
+    feasible = feasibility_matrix(sites, jobs)
+    capable = capable_sites(sites, jobs, feasible)
+    for e, job in enumerate(jobs):
+        if not capable[e]:
+            raise ValueError(f"No SDL site can perform job {job.name}.")
+    work = {(i, e): sum(sites[i].proc_time(op.opcode) for op in jobs[e]) for e in capable for i in capable[e]}
+
+    # Column makespans are kept here as well since the master needs all of them, while the
+    # shared cache may evict entries.
+    makespans: dict[tuple[int, frozenset], int] = {}
+
+    with SiteEvaluator(sites, n_workers, cache) as evaluator:
+        def evaluate_all(site_subsets: list[tuple[int, frozenset]]):
+            todo = {i: subset for i, subset in site_subsets if (i, subset) not in makespans}
+            results = evaluator.makespans(scheduler, {i: [jobs[e] for e in sorted(s)] for i, s in todo.items()})
+            for i, makespan in results.items():
+                makespans[i, todo[i]] = makespan
+
+        def evaluate(i: int, subset: frozenset) -> int:
+            evaluate_all([(i, subset)])
+            return makespans[i, subset]
+
+        # Initial columns: every site empty, plus a greedy load-balanced partition so that the master is feasible.
+        columns: list[tuple[int, frozenset]] = [(i, frozenset()) for i in range(len(sites))]
+        for i, subset in _greedy_assignment(sites, jobs, capable, work).items():
+            if subset:
+                columns.append((i, frozenset(subset)))
+        evaluate_all(columns[len(sites):])
+        evaluate_all(columns[:len(sites)])
+
+        def build_master(cat: str):
+            model = LpProblem('SDL-Partitioning-Master', LpMinimize)
+            makespan = LpVariable('Makespan', lowBound=0, cat=LpContinuous)
+            lam = [LpVariable(f'lambda_{c}', lowBound=0, upBound=1, cat=cat) for c in range(len(columns))]
+            model += makespan
+            for e in range(len(jobs)):
+                model += (lpSum(lam[c] for c, (_, subset) in enumerate(columns) if e in subset) == 1, f'cover_{e}')
+            for i in range(len(sites)):
+                at_site = [c for c, (site_id, _) in enumerate(columns) if site_id == i]
+                model += (lpSum(lam[c] for c in at_site) <= 1, f'site_{i}')
+                model += (makespan - lpSum(makespans[columns[c]] * lam[c] for c in at_site) >= 0, f'bound_{i}')
+            return model, lam
+
+        for _ in range(max_iterations):
+            if time_limit is not None and perf_counter() - start >= time_limit:
+                break
+            model, lam = build_master(LpContinuous)
+            model.solve(PULP_CBC_CMD(msg=msg))
+            if model.status != LpStatusOptimal:
+                break
+            pi = {e: model.constraints[f'cover_{e}'].pi for e in range(len(jobs))}
+            mu = {i: model.constraints[f'site_{i}'].pi for i in range(len(sites))}
+            sigma = {i: model.constraints[f'bound_{i}'].pi for i in range(len(sites))}
+
+            # Pricing: grow a subset per site, best dual value per unit of work first, and stop after
+            # `patience` prefixes in a row that do not improve the reduced cost.
+            known = set(columns)
+            new_columns = []
+            for i in range(len(sites)):
+                candidates = sorted((e for e in capable if i in capable[e]), key=lambda e: -pi[e] / max(work[i, e], 1))
+                subset, best_cost, stale = frozenset(), 0.0, 0
+                for e in candidates:
+                    subset = subset | {e}
+                    reduced_cost = -sum(pi[k] for k in subset) - mu[i] + sigma[i] * evaluate(i, subset)
+                    if reduced_cost < -1e-6 and (i, subset) not in known:
+                        new_columns.append((i, subset))
+                        known.add((i, subset))
+                    if reduced_cost < best_cost:
+                        best_cost, stale = reduced_cost, 0
+                    else:
+                        stale += 1
+                        if stale >= patience:
+                            break
+            if not new_columns:
+                break
+
+            # Rounding: give every job to the site whose columns cover it the most in the LP solution.
+            # These columns always form a complete partition, so the integer master keeps improving.
+            share = {}
+            for c, (i, subset) in enumerate(columns):
+                for e in subset:
+                    share[e, i] = share.get((e, i), 0) + lam[c].value()
+            rounded = {i: set() for i in range(len(sites))}
+            for e in capable:
+                rounded[max(capable[e], key=lambda i: (share.get((e, i), 0), -i))].add(e)
+            evaluate_all([(i, frozenset(subset)) for i, subset in rounded.items()])
+            for i, subset in rounded.items():
+                column = (i, frozenset(subset))
+                if column not in known:
+                    new_columns.append(column)
+                    known.add(column)
+            columns.extend(new_columns)
+
+    model, lam = build_master(LpBinary)
+    solver_time = None if time_limit is None else max(time_limit - (perf_counter() - start), 1)
+    model.solve(PULP_CBC_CMD(msg=msg, timeLimit=solver_time))
+    if model.sol_status not in (LpSolutionOptimal, LpSolutionIntegerFeasible):
+        raise ValueError("The partitioning master problem could not be solved.")
+
+    matching = {i: [] for i in range(len(sites))}
+    makespan = 0
+    for c, (i, subset) in enumerate(columns):
+        if lam[c].value() > 0.5:
+            matching[i].extend(jobs[e] for e in sorted(subset))
+            makespan = max(makespan, makespans[i, subset])
+    decs = PartitionDecisions(makespan=makespan, matching=matching)
+    if not validate_partitions(sites, jobs, decs, scheduler, evaluator.cache, feasible=feasible):
+        raise ValueError("Invalid partition decisions that do not follow necessary constraints.")
+    return decs
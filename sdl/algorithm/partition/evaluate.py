@@ -0,0 +1,80 @@
+from concurrent.futures import ProcessPoolExecutor
+from sdl.algorithm.partition.cache import ScheduleCache
+from sdl.algorithm.partition.io import site_makespan
+from sdl.algorithm.scheduling.io import ScheduleResult
+from sdl.lab import Job, SDLLab
+from typing import Callable, Optional
+
+# Set by `_init_worker` so that the sites are only sent once to each process.
+_worker_sites: Optional[list[SDLLab]] = None
+
+
+def _init_worker(sites: list[SDLLab]):
+    global _worker_sites
+    _worker_sites = sites
+
+
+def _site_makespan(scheduler: Callable[[SDLLab, list[Job]], ScheduleResult], site_id: int, jobs: list[Job]) -> int:
+    return site_makespan(scheduler, _worker_sites[site_id], jobs)
+
+
+class SiteEvaluator:
+    """Computes single-site makespans for partitions. Sites missing from the cache are scheduled
+    concurrently in a process pool whose workers receive the sites once at start-up, so a whole
+    partition takes about as long as its slowest site. With `n_workers=1` no pool is started.
+    The scheduler must be picklable, e.g. a module-level function, when a pool is used."""
+
+    def __init__(self, sites: list[SDLLab], n_workers: Optional[int] = 1, cache: Optional[ScheduleCache] = None):
+        self.sites = sites
+        self.cache = ScheduleCache() if cache is None else cache
+        self.pool = None
+        if n_workers is None or n_workers > 1:
+            self.pool = ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(sites,))
+
+    def makespans(self, scheduler: Callable[[SDLLab, list[Job]], ScheduleResult],
+                  matching: dict[int, list[Job]]) -> dict[int, int]:
+        """Makespan of every site in `matching`, which may cover only some of the sites."""
+        return self.batch_makespans(scheduler, [matching])[0]
+
+    def batch_makespans(self, scheduler: Callable[[SDLLab, list[Job]], ScheduleResult],
+                        matchings: list[dict[int, list[Job]]]) -> list[dict[int, int]]:
+        """Makespans of several matchings, with the sites of all of them scheduled concurrently.
+        A (site, jobs) pair shared by several matchings is only scheduled once."""
+        results = [{} for _ in matchings]
+        missing = {}
+        for r, matching in enumerate(matchings):
+            for i, site_jobs in matching.items():
+                key = self.cache.key(scheduler, i, site_jobs)
+                makespan = self.cache.get(key)
+                if makespan is None:
+                    missing.setdefault(key, (i, site_jobs, []))[2].append(r)
+                else:
+                    results[r][i] = makespan
+        if self.pool is not None and len(missing) > 1:
+            futures = {key: self.pool.submit(_site_makespan, scheduler, i, site_jobs)
+                       for key, (i, site_jobs, _) in missing.items()}
+            computed = {key: future.result() for key, future in futures.items()}
+        else:
+            computed = {key: site_makespan(scheduler, self.sites[i], site_jobs)
+                        for key, (i, site_jobs, _) in missing.items()}
+        for key, makespan in computed.items():
+            self.cache.put(key, makespan)
+            i, _, rows = missing[key]
+            for r in rows:
+                results[r][i] = makespan
+        return results
+
+    def makespan(self, scheduler: Callable[[SDLLab, list[Job]], ScheduleResult], site_id: int,
+                 jobs: list[Job]) -> int:
+        return self.makespans(scheduler, {site_id: jobs})[site_id]
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,57 @@
+import numpy as np
+
+from sdl.lab import Job, SDLLab
+from typing import Optional
+
+
+def opcode_index(sites: list[SDLLab], jobs: list[Job]) -> dict[int, int]:
+    """Bit position of every opcode used by the sites or the jobs."""
+    opcodes = set()
+    for site in sites:
+        opcodes.update(site.opcodes)
+    for job in jobs:
+        opcodes.update(op.opcode for op in job)
+    return {opcode: pos for pos, opcode in enumerate(sorted(opcodes))}
+
+
+def _bitsets(opcode_sets: list, index: dict[int, int]) -> np.ndarray:
+    rows = np.fromiter((r for r, opcodes in enumerate(opcode_sets) for _ in opcodes), dtype=np.int64)
+    bits = np.fromiter((index[opcode] for opcodes in opcode_sets for opcode in opcodes), dtype=np.int64)
+    words = np.zeros((len(opcode_sets), max((len(index) + 63) // 64, 1)), dtype=np.uint64)
+    np.bitwise_or.at(words, (rows, bits >> 6), np.left_shift(np.uint64(1), (bits & 63).astype(np.uint64)))
+    return words
+
+
+def site_bitsets(sites: list[SDLLab], index: dict[int, int]) -> np.ndarray:
+    """(sites, words) array with the bits of the opcodes each site has a machine for."""
+    return _bitsets([site.opcodes for site in sites], index)
+
+
+def job_bitsets(jobs: list[Job], index: dict[int, int]) -> np.ndarray:
+    """(jobs, words) array with the bits of the opcodes each job needs."""
+    return _bitsets([{op.opcode for op in job} for job in jobs], index)
+
+
+def feasibility_matrix(sites: list[SDLLab], jobs: list[Job], chunk_size: int = 4096) -> np.ndarray:
+    """
+    Boolean (jobs, sites) matrix that is True where the site has machines for every opcode of the
+    job. A job fits a site iff its opcode bitset has no bit outside the site's capability bitset.
+    Partitioners compute it once per run and pass it on to `capable_sites` and
+    `validate_partitions`. The returned array is read-only.
+    """
+    index = opcode_index(sites, jobs)
+    missing = ~site_bitsets(sites, index)
+    needed = job_bitsets(jobs, index)
+    feasible = np.empty((len(jobs), len(sites)), dtype=bool)
+    for lo in range(0, len(jobs), chunk_size):
+        chunk = needed[lo:lo + chunk_size, None, :] & missing[None, :, :]
+        feasible[lo:lo + chunk_size] = ~chunk.any(axis=2)
+    feasible.flags.writeable = False
+    return feasible
+
+
+def capable_sites(sites: list[SDLLab], jobs: list[Job], feasible: Optional[np.ndarray] = None) -> dict[int, list[int]]:
+    """Positions of the sites that can perform each job, keyed by the job's position in `jobs`."""
+    if feasible is None:
+        feasible = feasibility_matrix(sites, jobs)
+    return {e: np.flatnonzero(row).tolist() for e, row in enumerate(feasible)}
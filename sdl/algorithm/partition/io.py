@@ -1,8 +1,16 @@
+import numpy as np
+
 from dataclasses import dataclass
-from typing import Callable, Tuple
+from typing import Callable, Optional, Tuple, TYPE_CHECKING
 
+from sdl.algorithm.partition.feasibility import feasibility_matrix
+from sdl.algorithm.scheduling.io import ScheduleResult
 from sdl.lab import SDLLab, Job
 
+if TYPE_CHECKING:
+    from sdl.algorithm.partition.cache import ScheduleCache
+    from sdl.algorithm.partition.evaluate import SiteEvaluator
+
 
 @dataclass(frozen=True)
 class PartitionDecisions:
@@ -10,31 +18,51 @@ class PartitionDecisions:
     matching: dict[int, list[Job]]  # or `dict[SdlID, set[ExperimentID]]`
 
 
+def site_makespan(scheduler: Callable[[SDLLab, list[Job]], Tuple], site: SDLLab, jobs: list[Job]) -> int:
+    """Makespan of `jobs` on `site`, for schedulers returning a `ScheduleResult` or a tuple
+    starting with the makespan. A site without jobs has a makespan of 0."""
+    if not jobs:
+        return 0
+    result = scheduler(site, jobs)
+    return result.makespan if isinstance(result, ScheduleResult) else result[0]
+
+
 def validate_partitions(
         sites: list[SDLLab],
         jobs: list[Job],
         decs: PartitionDecisions,
-        scheduler: Callable[[SDLLab, list[Job]], Tuple]
+        scheduler: Callable[[SDLLab, list[Job]], Tuple],
+        cache: Optional['ScheduleCache'] = None,
+        evaluator: Optional['SiteEvaluator'] = None,
+        feasible: Optional[np.ndarray] = None
 ) -> bool:
     site_jobs = {i: decs.matching[i] for i, _ in enumerate(sites)}
 
     # Constraint (1): Single-site makespans must be <= global makespan.
-    for i, site in enumerate(sites):
-        if decs.makespan < scheduler(site, site_jobs[i])[0]:
-            return False
+    if evaluator is not None:
+        makespans = evaluator.makespans(scheduler, site_jobs)
+    elif cache is not None:
+        makespans = {i: cache.makespan(scheduler, i, site, site_jobs[i]) for i, site in enumerate(sites)}
+    else:
+        makespans = {i: site_makespan(scheduler, site, site_jobs[i]) for i, site in enumerate(sites)}
+    if any(decs.makespan < makespan for makespan in makespans.values()):
+        return False
 
     # Constraint (2): Experiments can only be assigned to, at most, 1 SDL site.
     for i, i_jobs in site_jobs.items():
         for j, j_jobs in site_jobs.items():
             if i != j:
-                if set(i_jobs).intersection(set(j_jobs)):
+                if {job.idx for job in i_jobs}.intersection(job.idx for job in j_jobs):
                     return False
 
     # Constraint (3): Experiments can only be assigned to SDL sites with the
     #                 equipment to run them.
+    if feasible is None:
+        feasible = feasibility_matrix(sites, jobs)
+    position = {job.idx: e for e, job in enumerate(jobs)}
     for i, site in enumerate(sites):
         for j in site_jobs[i]:
-            if not site.can_perform(j):
+            if not (feasible[position[j.idx], i] if j.idx in position else site.can_perform(j)):
                 return False
 
     # Constraint (4): Ensures each SDL site has enough exhaustible materials to
@@ -0,0 +1,76 @@
+from numpy.random import RandomState
+from sdl.algorithm.partition.cache import ScheduleCache
+from sdl.algorithm.partition.evaluate import SiteEvaluator
+from sdl.algorithm.partition.feasibility import capable_sites, feasibility_matrix
+from sdl.algorithm.partition.io import PartitionDecisions, validate_partitions
+from sdl.algorithm.scheduling.io import ScheduleResult
+from sdl.lab import Job, SDLLab
+from time import perf_counter
+from typing import Callable, Optional
+
+
+def improve_partition(
+        sites: list[SDLLab],
+        jobs: list[Job],
+        decs: PartitionDecisions,
+        scheduler: Callable[[SDLLab, list[Job]], ScheduleResult],
+        time_limit: Optional[float] = 10.0,
+        random_state: Optional[RandomState] = None,
+        cache: Optional[ScheduleCache] = None,
+        n_workers: int = 1
+) -> PartitionDecisions:
+    """
+    Improves a partition by moving jobs out of the site that defines the global makespan, or
+    swapping them with jobs of another site. Only the two sites touched by a move are scheduled
+    again. A move is taken as soon as it lowers the sorted vector of site makespans, so moves that
+    shorten the critical site without changing the global makespan are still accepted. Stops at a
+    local optimum or after `time_limit` seconds and returns the best partition found. With
+    `n_workers > 1` the two sites of a move are scheduled in parallel.
+    """
+    if random_state is None:
+        random_state = RandomState()
+    start = perf_counter()
+    position = {job.idx: e for e, job in enumerate(jobs)}
+    feasible = feasibility_matrix(sites, jobs)
+    capable = {e: set(site_ids) for e, site_ids in capable_sites(sites, jobs, feasible).items()}
+    subsets = {i: frozenset(position[job.idx] for job in decs.matching.get(i, [])) for i in range(len(sites))}
+
+    with SiteEvaluator(sites, n_workers, cache) as evaluator:
+        def evaluate(site_subsets: dict[int, frozenset]) -> dict[int, int]:
+            return evaluator.makespans(scheduler, {i: [jobs[e] for e in sorted(s)] for i, s in site_subsets.items()})
+
+        makespans = evaluate(subsets)
+
+        def neighbours(critical: int):
+            """Moves and swaps out of the critical site, in random order."""
+            own = list(subsets[critical])
+            for e in random_state.permutation(own):
+                for k in random_state.permutation(len(sites)):
+                    if k == critical or k not in capable[e]:
+                        continue
+                    yield k, subsets[critical] - {e}, subsets[k] | {e}
+                    for f in random_state.permutation(list(subsets[k])):
+                        if critical in capable[f]:
+                            yield k, subsets[critical] - {e} | {f}, subsets[k] - {f} | {e}
+
+        improved = True
+        while improved and (time_limit is None or perf_counter() - start < time_limit):
+            improved = False
+            current = sorted(makespans.values(), reverse=True)
+            critical = max(makespans, key=makespans.get)
+            for k, critical_subset, other_subset in neighbours(critical):
+                if time_limit is not None and perf_counter() - start >= time_limit:
+                    break
+                candidate = dict(makespans)
+                candidate.update(evaluate({critical: critical_subset, k: other_subset}))
+                if sorted(candidate.values(), reverse=True) < current:
+                    subsets[critical], subsets[k] = critical_subset, other_subset
+                    makespans = candidate
+                    improved = True
+                    break
+
+    matching = {i: [jobs[e] for e in sorted(subset)] for i, subset in subsets.items()}
+    decs = PartitionDecisions(makespan=max(makespans.values()), matching=matching)
+    if not validate_partitions(sites, jobs, decs, scheduler, evaluator.cache, feasible=feasible):
+        raise ValueError("Invalid partition decisions that do not follow necessary constraints.")
+    return decs
@@ -1,23 +1,14 @@
+import numpy as np
+
 from pulp import *
-from sdl.algorithm.scheduling.io import SchedulingDecisions, ScheduleResult
+from sdl.algorithm.partition.cache import ScheduleCache
+from sdl.algorithm.partition.evaluate import SiteEvaluator
+from sdl.algorithm.partition.feasibility import feasibility_matrix
+from sdl.algorithm.partition.io import PartitionDecisions, validate_partitions
+from sdl.algorithm.scheduling.io import ScheduleResult
 from sdl.lab import Job, SDLLab
-from typing import Callable, Optional, Tuple
-
-
-def single_site_makespan(
-        scheduler: Callable[[SDLLab, list[Job]], ScheduleResult],
-        site_id: int,
-        site: SDLLab,
-        jobs: list[Job],
-        partition_decisions: LpVariable.dicts
-):
-    i = site_id
-    site_jobs = [
-        job
-        for j, job in enumerate(jobs)
-        if partition_decisions[i, j].value() == 1
-    ]
-    return scheduler(site, site_jobs).makespan  # TODO: Make the Tuple to be SchedulingDecisions
+from time import perf_counter
+from typing import Callable, Optional
 
 
 def opt_partition(
@@ -26,38 +17,102 @@ def opt_partition(
         scheduler: Callable[[SDLLab, list[Job]], ScheduleResult],
         msg: bool = False,
         limit: Optional[int] = None,
-        time_limit: Optional[int] = None
-):
+        time_limit: Optional[int] = None,
+        max_iterations: int = 50,
+        gap: float = 0.0,
+        n_workers: int = 1,
+        cache: Optional[ScheduleCache] = None
+) -> PartitionDecisions:
+    """
+    Partitions the jobs over the sites with a logic-based Benders decomposition. The master MIP
+    assigns every job to one site that can perform it and bounds the makespan from below with
+    workload surrogates built from the site durations: the longest assigned job and, per opcode,
+    the assigned work divided by the number of machines that can do it. Every iteration schedules
+    the sites of the master's assignment with `scheduler` (in parallel with `n_workers > 1`) and
+    adds one cut per site,
+
+        makespan >= T_i - sum_{e in S_i} (1 - z[i, e]) * work[i, e],
+
+    since removing job `e` from site `i` shortens its schedule by at most the work of `e`. The loop
+    stops once the best schedule found is within `gap` (relative) of the master bound, after
+    `max_iterations`, or after `time_limit` seconds. The bound is only exact for exact schedulers.
+    """
     if limit is None:
         limit = 1_000_000
+    start = perf_counter()
 
-    # Initialize the ILP and its decision variables.
+    feasible = feasibility_matrix(sites, jobs)
+    for e in np.flatnonzero(~feasible.any(axis=1)):
+        raise ValueError(f"No SDL site can perform job {jobs[e].name}.")
+    ie = [(int(i), int(e)) for e, i in zip(*np.nonzero(feasible))]
+    capable = set(ie)
+    work = {(i, e): sum(sites[i].proc_time(op.opcode) for op in jobs[e]) for i, e in ie}
+
+    # Initialize the master problem and its decision variables.
     model = LpProblem('SDL-Partitioning', LpMinimize)
-    ie = [(i, e) for i in range(len(sites)) for e in range(len(jobs))]
-    makespan = LpVariable("Makespan", lowBound=0, upBound=None, cat=LpContinuous)
+    makespan = LpVariable("Makespan", lowBound=0, upBound=limit, cat=LpContinuous)
     z = LpVariable.dicts("Partition Assignment", indices=ie, cat=LpBinary)
 
     # Initialize the objective function.
     model += makespan
 
-    # Constraint (1): Single-site makespans must be <= makespan decision variable.
-    for i, site in enumerate(sites):
-        model += single_site_makespan(scheduler, i, site, jobs, z) <= makespan
-
-    # Cosntraint (2): Experiments can only be assigned to, at most, 1 SDL site.
+    # Constraint (1): Every experiment is assigned to exactly 1 SDL site. Constraint (3) from the
+    #                 monolithic model, experiments only go to SDL sites with the equipment to run
+    #                 them, is enforced by only creating variables for capable pairs.
     for e in range(len(jobs)):
-        model += lpSum(z[i, e] for i in range(len(sites))) <= 1
+        model += lpSum(z[i, e] for i in range(len(sites)) if (i, e) in capable) == 1
 
-    # Constraint (3): Experiments can only be assigned to SDL sites with the equipment to run them.
+    # Constraint (2): Workload surrogates of the single-site makespans.
+    for i, e in ie:
+        model += makespan >= work[i, e] * z[i, e]
     for i, site in enumerate(sites):
-        for e, exp in enumerate(jobs):
-            model += z[i, e] <= int(site.can_perform(exp))
+        for opcode, machine_ids in site.op_to_machine_ids.items():
+            opcode_work = lpSum(
+                site.proc_time(opcode) * sum(op.opcode == opcode for op in jobs[e]) * z[i, e]
+                for e in range(len(jobs)) if (i, e) in capable
+            )
+            model += makespan * len(machine_ids) >= opcode_work
 
     # Constraint (4): Ensures each SDL site has enough exhaustible materials to run each experiment assigned to it.
     # for i, site in enumerate(sites):
     #     pass  # TODO
 
-    return (
-        makespan.value(),
-        {key: z[key].value() for key in z}
-    )
+    best_makespan, best_matching = None, None
+    seen = set()
+    with SiteEvaluator(sites, n_workers, cache) as evaluator:
+        for _ in range(max_iterations):
+            solver_time = None if time_limit is None else max(time_limit - (perf_counter() - start), 1)
+            model.solve(PULP_CBC_CMD(msg=msg, timeLimit=solver_time))
+            if model.sol_status not in (LpSolutionOptimal, LpSolutionIntegerFeasible):
+                break
+            # A master problem stopped by the time limit does not give a valid bound.
+            lower_bound = makespan.value() if model.sol_status == LpSolutionOptimal else 0
+
+            assignment = tuple(sorted(key for key in ie if z[key].value() > 0.5))
+            if assignment in seen:
+                break
+            seen.add(assignment)
+            matching = {i: [] for i in range(len(sites))}
+            for i, e in assignment:
+                matching[i].append(jobs[e])
+
+            makespans = evaluator.makespans(scheduler, matching)
+            if best_makespan is None or max(makespans.values()) < best_makespan:
+                best_makespan, best_matching = max(makespans.values()), matching
+            if best_makespan - lower_bound <= gap * best_makespan:
+                break
+            if time_limit is not None and perf_counter() - start >= time_limit:
+                break
+
+            # Benders cuts: the site keeps at least its scheduled makespan unless jobs are moved away.
+            for i in range(len(sites)):
+                model += makespan >= makespans[i] - lpSum(
+                    (1 - z[i, e]) * work[i, e] for (site_id, e) in assignment if site_id == i
+                )
+
+    if best_matching is None:
+        raise ValueError("The partitioning master problem could not be solved.")
+    decs = PartitionDecisions(makespan=best_makespan, matching=best_matching)
+    if not validate_partitions(sites, jobs, decs, scheduler, evaluator.cache, feasible=feasible):
+        raise ValueError("Invalid partition decisions that do not follow necessary constraints.")
+    return decs
@@ -1,10 +1,32 @@
+import numpy as np
+
+from dataclasses import dataclass
 from numpy.random import RandomState
+from sdl.algorithm.partition.cache import ScheduleCache
+from sdl.algorithm.partition.evaluate import SiteEvaluator
+from sdl.algorithm.partition.feasibility import capable_sites, feasibility_matrix
 from sdl.algorithm.partition.io import PartitionDecisions, validate_partitions
 from sdl.algorithm.scheduling.io import SchedulingDecisions
 from sdl.lab import Job, SDLLab
 from typing import Callable, Optional, Tuple
 
 
+@dataclass(frozen=True)
+class MultiStartResult:
+    best: PartitionDecisions
+    best_sample: int
+    makespans: list[int]
+
+
+def _draw_partition(sites: list[SDLLab], jobs: list[Job], valid_sites_for_jobs: dict[int, list[int]],
+                    random_state: RandomState) -> dict[int, list[Job]]:
+    partitions = {site_id: [] for site_id, _ in enumerate(sites)}
+    for job_id in valid_sites_for_jobs:
+        site_id = random_state.choice(valid_sites_for_jobs[job_id])
+        partitions[site_id].append(jobs[job_id])
+    return partitions
+
+
 def random_partition(
         sites: list[SDLLab],
         jobs: list[Job],
@@ -12,22 +34,48 @@ def random_partition(
         msg: bool = False,
         limit: Optional[int] = None,
         time_limit: Optional[int] = None,
-        random_state: Optional[RandomState] = None
+        random_state: Optional[RandomState] = None,
+        cache: Optional[ScheduleCache] = None,
+        n_workers: int = 1
 ) -> PartitionDecisions:
     if random_state is None:
         random_state = RandomState()
 
-    valid_sites_for_jobs = {
-        job_id: [site_id for site_id, site in enumerate(sites) if site.can_perform(job)]
-        for job_id, job in enumerate(jobs)
-    }
-    partitions = {site_id: [] for site_id, _ in enumerate(sites)}
-    for job_id in valid_sites_for_jobs:
-        site_id = random_state.choice(valid_sites_for_jobs[job_id])
-        partitions[site_id].append(jobs[job_id])
+    feasible = feasibility_matrix(sites, jobs)
+    partitions = _draw_partition(sites, jobs, capable_sites(sites, jobs, feasible), random_state)
 
-    makespan = max(scheduler(site, partitions[site_id])[0] for site_id, site in enumerate(sites))
-    decs = PartitionDecisions(makespan=makespan, matching=partitions)
-    if not validate_partitions(sites, jobs, decs, scheduler):
-        raise ValueError("Invalid partition decisions that do not follow necessary constraints.")
+    with SiteEvaluator(sites, n_workers, cache) as evaluator:
+        makespan = max(evaluator.makespans(scheduler, partitions).values())
+        decs = PartitionDecisions(makespan=makespan, matching=partitions)
+        if not validate_partitions(sites, jobs, decs, scheduler, evaluator=evaluator, feasible=feasible):
+            raise ValueError("Invalid partition decisions that do not follow necessary constraints.")
     return decs
+
+
+def multistart_random_partition(
+        sites: list[SDLLab],
+        jobs: list[Job],
+        scheduler: Callable[[SDLLab, list[Job]], Tuple],
+        n_samples: int = 16,
+        seed: Optional[int] = None,
+        cache: Optional[ScheduleCache] = None,
+        n_workers: int = 1
+) -> MultiStartResult:
+    """
+    Draws `n_samples` random partitions and keeps the one with the smallest makespan. Every sample
+    has its own stream spawned from `numpy.random.SeedSequence(seed)`, so sample `k` is the same
+    for a given seed whatever `n_samples` or `n_workers` is. All site schedules of all samples are
+    evaluated together, in parallel with `n_workers > 1`. `makespans` holds the makespan of every
+    sample in order.
+    """
+    children = np.random.SeedSequence(seed).spawn(n_samples)
+    feasible = feasibility_matrix(sites, jobs)
+    capable = capable_sites(sites, jobs, feasible)
+    samples = [_draw_partition(sites, jobs, capable, RandomState(np.random.MT19937(child))) for child in children]
+    with SiteEvaluator(sites, n_workers, cache) as evaluator:
+        makespans = [max(site_makespans.values()) for site_makespans in evaluator.batch_makespans(scheduler, samples)]
+        best_sample = int(np.argmin(makespans))
+        decs = PartitionDecisions(makespan=makespans[best_sample], matching=samples[best_sample])
+        if not validate_partitions(sites, jobs, decs, scheduler, evaluator=evaluator, feasible=feasible):
+            raise ValueError("Invalid partition decisions that do not follow necessary constraints.")
+    return MultiStartResult(best=decs, best_sample=best_sample, makespans=makespans)
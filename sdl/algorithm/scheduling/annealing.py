@@ -0,0 +1,173 @@
+import math
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from sdl.algorithm.scheduling.genetic import Chromosome, Individual
+from sdl.lab import SDLLab, Job
+from time import perf_counter
+from typing import Callable, List, Optional, Union
+
+
+def geometric_cooling(t_start: float, t_end: float, progress: float) -> float:
+    return t_start * (t_end / t_start) ** progress
+
+
+def linear_cooling(t_start: float, t_end: float, progress: float) -> float:
+    return t_start + (t_end - t_start) * progress
+
+
+def logarithmic_cooling(t_start: float, t_end: float, progress: float) -> float:
+    return t_start / (1 + (t_start / t_end - 1) * math.log(1 + (math.e - 1) * progress))
+
+
+COOLING_SCHEDULES = {
+    'geometric': geometric_cooling,
+    'linear': linear_cooling,
+    'logarithmic': logarithmic_cooling,
+}
+
+CoolingSchedule = Callable[[float, float, float], float]
+
+# Set by `_init_worker` so that the lab and jobs are only sent once to each process.
+_worker_lab: Optional[SDLLab] = None
+_worker_jobs: Optional[List[Job]] = None
+
+
+def neighbor(individual: Individual, random_state: np.random.RandomState) -> Individual:
+    """Apply one of the genetic mutation operators to a copy of the individual."""
+    candidate = individual.copy()
+    if random_state.random() < 0.5:
+        candidate.mutate_machine_selection(random_state)
+    else:
+        candidate.mutate_operation_sequence(random_state)
+    if not candidate.valid:
+        candidate.update_fitness()
+    return candidate
+
+
+def anneal_chain(
+        current: Individual, n_steps: int, t_start: float, t_end: float,
+        random_state: np.random.RandomState, deadline: Optional[float] = None
+):
+    """Run `n_steps` Metropolis steps while cooling geometrically from `t_start` to `t_end`.
+    Returns the last accepted individual, the best individual seen and the number of steps done."""
+    best = current
+    step = 0
+    for step in range(n_steps):
+        if deadline is not None and perf_counter() >= deadline:
+            break
+        temperature = geometric_cooling(t_start, t_end, step / n_steps)
+        candidate = neighbor(current, random_state)
+        delta = candidate.fitness - current.fitness
+        if delta <= 0 or random_state.random() < math.exp(-delta / temperature):
+            current = candidate
+            if current.fitness < best.fitness:
+                best = current
+    else:
+        step = n_steps
+    return current, best, step
+
+
+def _init_worker(lab: SDLLab, jobs: List[Job]):
+    global _worker_lab, _worker_jobs
+    _worker_lab = lab
+    _worker_jobs = jobs
+
+
+def _run_replica(chromosome: Chromosome, n_steps: int, t_start: float, t_end: float, seed: int,
+                 time_left: Optional[float]):
+    deadline = None if time_left is None else perf_counter() + time_left
+    current = Individual(chromosome, _worker_lab, _worker_jobs)
+    current, best, steps = anneal_chain(current, n_steps, t_start, t_end, np.random.RandomState(seed), deadline)
+    return current.chromosome, current.fitness, best.chromosome, best.fitness, steps
+
+
+def anneal_solve(
+        lab: SDLLab, jobs: List[Job], random_state: np.random.RandomState,
+        initial: Individual = None, cooling: Union[str, CoolingSchedule] = 'geometric',
+        initial_temperature: Optional[float] = None, final_temperature: float = 1.0,
+        max_iterations: int = 100_000, time_limit: Optional[float] = None,
+        steps_per_round: int = 1_000, n_replicas: int = 1, n_workers: Optional[int] = None
+):
+    """Solve the problem using simulated annealing over the genetic `Chromosome` encoding.
+
+    The search stops after `max_iterations` steps per replica or after `time_limit` seconds,
+    whichever comes first; the temperature follows `cooling` over that budget. With
+    `n_replicas > 1` the replicas run on a temperature ladder in separate processes
+    (parallel tempering) and neighbouring replicas try to swap states every `steps_per_round`
+    steps. The return value matches `genetic_solve`.
+    """
+    schedule = COOLING_SCHEDULES[cooling] if isinstance(cooling, str) else cooling
+    start = perf_counter()
+    deadline = None if time_limit is None else start + time_limit
+
+    current = initial if initial is not None else Individual.create_random_chromosome(lab, jobs, random_state)
+    if initial_temperature is None:
+        initial_temperature = max(0.05 * current.fitness, final_temperature + 1)
+
+    def progress(iteration: int) -> float:
+        p = iteration / max_iterations
+        if deadline is not None:
+            p = max(p, (perf_counter() - start) / time_limit)
+        return min(p, 1.0)
+
+    def ladder(p: float) -> List[float]:
+        t = schedule(initial_temperature, final_temperature, p)
+        ratio = (initial_temperature / final_temperature) ** (1 / max(n_replicas, 2))
+        return [t * ratio ** k for k in range(n_replicas)]
+
+    best = current
+    fitness_history = [best.fitness]
+    iteration = 0
+
+    if n_replicas == 1:
+        while iteration < max_iterations and (deadline is None or perf_counter() < deadline):
+            n_steps = min(steps_per_round, max_iterations - iteration)
+            t_start = schedule(initial_temperature, final_temperature, progress(iteration))
+            t_end = schedule(initial_temperature, final_temperature, progress(iteration + n_steps))
+            current, round_best, steps = anneal_chain(current, n_steps, t_start, t_end, random_state, deadline)
+            if round_best.fitness < best.fitness:
+                best = round_best
+            iteration += steps
+            fitness_history.append(best.fitness)
+        return best.fitness, best.SJs, best.Ms, best.chromosome, fitness_history
+
+    states = [(current.chromosome, current.fitness)]
+    for _ in range(n_replicas - 1):
+        replica = Individual.create_random_chromosome(lab, jobs, random_state)
+        states.append((replica.chromosome, replica.fitness))
+        if replica.fitness < best.fitness:
+            best = replica
+    best_chromosome, best_fitness = best.chromosome, best.fitness
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(lab, jobs)) as pool:
+        while iteration < max_iterations and (deadline is None or perf_counter() < deadline):
+            n_steps = min(steps_per_round, max_iterations - iteration)
+            temps_start = ladder(progress(iteration))
+            temps_end = ladder(progress(iteration + n_steps))
+            time_left = None if deadline is None else deadline - perf_counter()
+            futures = [
+                pool.submit(_run_replica, chromosome, n_steps, temps_start[k], temps_end[k],
+                            random_state.randint(0, 2 ** 31 - 1), time_left)
+                for k, (chromosome, _) in enumerate(states)
+            ]
+            states = []
+            steps = 0
+            for future in futures:
+                chromosome, fitness, round_best_chromosome, round_best_fitness, replica_steps = future.result()
+                states.append((chromosome, fitness))
+                steps = max(steps, replica_steps)
+                if round_best_fitness < best_fitness:
+                    best_chromosome, best_fitness = round_best_chromosome, round_best_fitness
+            iteration += steps
+
+            # Attempt swaps between neighbouring temperatures, from the coldest replica upwards.
+            for k in range(n_replicas - 1):
+                (_, f_cold), (_, f_hot) = states[k], states[k + 1]
+                exponent = (f_cold - f_hot) * (1 / temps_end[k] - 1 / temps_end[k + 1])
+                if exponent >= 0 or random_state.random() < math.exp(exponent):
+                    states[k], states[k + 1] = states[k + 1], states[k]
+            fitness_history.append(best_fitness)
+
+    best = Individual(best_chromosome, lab, jobs)
+    return best.fitness, best.SJs, best.Ms, best.chromosome, fitness_history
@@ -0,0 +1,97 @@
+import heapq
+
+from sdl.algorithm.scheduling.genetic import find_starting_time
+from sdl.algorithm.scheduling.io import ScheduleResult, job_schedules_from
+from sdl.lab import Job, SDLLab, MachineSchedule
+from typing import List, Tuple
+
+
+class BeamState:
+    """A partial schedule. All fields are tuples, so forking a state only rebuilds the
+    entries touched by the new placement and shares the other machine timelines."""
+    __slots__ = ('job_step', 'job_ready', 'timelines', 'makespan')
+
+    def __init__(self, job_step: Tuple[int, ...], job_ready: Tuple[int, ...],
+                 timelines: Tuple[Tuple[MachineSchedule, ...], ...], makespan: int):
+        self.job_step = job_step
+        self.job_ready = job_ready
+        self.timelines = timelines
+        self.makespan = makespan
+
+    def fork(self, j: int, m: int, index: int, entry: MachineSchedule) -> 'BeamState':
+        timeline = self.timelines[m]
+        return BeamState(
+            job_step=self.job_step[:j] + (self.job_step[j] + 1,) + self.job_step[j + 1:],
+            job_ready=self.job_ready[:j] + (entry.end_time,) + self.job_ready[j + 1:],
+            timelines=self.timelines[:m] + (timeline[:index] + (entry,) + timeline[index:],) + self.timelines[m + 1:],
+            makespan=max(self.makespan, entry.end_time),
+        )
+
+
+def solve(lab: SDLLab, jobs: List[Job], beam_width: int = 8):
+    """Beam search over the same placements as `Grasp.construct`: at every step each state in the
+    beam places the next operation of one unfinished job on the machine where it can start the
+    earliest. Children are scored by a lower bound on the final makespan (current makespan, the
+    longest remaining job chain and the average machine load), ties go to the earliest completion
+    as in GRASP, and the best `beam_width` distinct states survive. `beam_width=1` is a greedy
+    construction; larger widths trade time for quality.
+    """
+    if not lab.machines:
+        raise ValueError("Beam search needs a lab with at least one machine.")
+    machine_pos = {machine.idx: m for m, machine in enumerate(lab.machines)}
+    durations = [[lab.proc_time(op.opcode) for op in job] for job in jobs]
+    remaining = []  # remaining[j][s] is the total work of job j from step s onwards
+    for job_durations in durations:
+        suffix = [0] * (len(job_durations) + 1)
+        for s in range(len(job_durations) - 1, -1, -1):
+            suffix[s] = suffix[s + 1] + job_durations[s]
+        remaining.append(suffix)
+    eligible = [[[machine_pos[m] for m in lab.op_to_machine_ids[op.opcode]] for op in job] for job in jobs]
+    load_bound = sum(r[0] for r in remaining) / len(lab.machines)
+    total_steps = sum(len(job) for job in jobs)
+
+    beam = [BeamState(tuple(0 for _ in jobs), tuple(0 for _ in jobs),
+                      tuple(() for _ in lab.machines), 0)]
+    for _ in range(total_steps):
+        candidates = []
+        for b, state in enumerate(beam):
+            chain = [state.job_ready[j] + remaining[j][state.job_step[j]] for j in range(len(jobs))]
+            longest = heapq.nlargest(2, range(len(chain)), key=chain.__getitem__) + [None]
+            for j, job in enumerate(jobs):
+                step = state.job_step[j]
+                if step == len(job):
+                    continue
+                duration = durations[j][step]
+                best = None
+                for m in eligible[j][step]:
+                    start, index = find_starting_time(state.timelines[m], duration, state.job_ready[j])
+                    if best is None or start < best[0]:
+                        best = (start, m, index)
+                start, m, index = best
+                end = start + duration
+                other = longest[0] if longest[0] != j else longest[1]
+                chain_bound = max(end + remaining[j][step + 1], chain[other] if other is not None else 0)
+                score = max(state.makespan, end, chain_bound, load_bound)
+                candidates.append((score, end, b, j, m, index, start))
+        candidates.sort()
+        # The time each machine's timeline ends, as part of the key of the states forked from it.
+        free = [tuple(timeline[-1].end_time if timeline else 0 for timeline in state.timelines) for state in beam]
+        next_beam, seen = [], set()
+        for _, end, b, j, m, index, start in candidates:
+            state = beam[b]
+            # Placing the same operations in a different order often reaches the same state.
+            key = (state.job_step[:j] + (state.job_step[j] + 1,) + state.job_step[j + 1:],
+                   state.job_ready[:j] + (end,) + state.job_ready[j + 1:],
+                   free[b][:m] + (max(free[b][m], end),) + free[b][m + 1:])
+            if key in seen:
+                continue
+            seen.add(key)
+            step = state.job_step[j]
+            next_beam.append(state.fork(j, m, index, MachineSchedule(jobs[j].idx, step, jobs[j].ops[step], start, end)))
+            if len(next_beam) == beam_width:
+                break
+        beam = next_beam
+
+    best = min(beam, key=lambda state: state.makespan)
+    Ms = {machine.idx: list(best.timelines[m]) for m, machine in enumerate(lab.machines)}
+    return ScheduleResult(makespan=best.makespan, machine_schedules=Ms, job_schedules=job_schedules_from(Ms, jobs))
@@ -0,0 +1,229 @@
+import heapq
+
+import numpy as np
+
+from functools import cached_property
+from sdl.algorithm.scheduling.io import SCHEDULE_DTYPE, ColumnarSchedule, ScheduleResult, job_schedules_from
+from sdl.lab import Job, SDLLab, MachineSchedule
+from typing import Callable, List, Sequence, Union
+
+
+class CompiledInstance:
+    """Index-based view of a lab and its jobs shared by the dispatching rules. Jobs and machines
+    are addressed by their position in `jobs` and `lab.machines`, not by their `idx`."""
+
+    def __init__(self, lab: SDLLab, jobs: Sequence[Job]):
+        self.jobs = jobs
+        self.machine_ids = [machine.idx for machine in lab.machines]
+        machine_pos = {idx: m for m, idx in enumerate(self.machine_ids)}
+        self.durations = [[lab.proc_time(op.opcode) for op in job] for job in jobs]
+        self.remaining = []  # remaining[j][s] is the total work of job j from step s onwards
+        for job_durations in self.durations:
+            suffix = [0] * (len(job_durations) + 1)
+            for s in range(len(job_durations) - 1, -1, -1):
+                suffix[s] = suffix[s + 1] + job_durations[s]
+            self.remaining.append(suffix)
+        self.eligible = [
+            [tuple(sorted(machine_pos[m] for m in lab.op_to_machine_ids[op.opcode])) for op in job]
+            for job in jobs
+        ]
+        self.flexibility = [len(machine.ops) for machine in lab.machines]
+        self.n_ops = sum(len(job) for job in jobs)
+
+    @classmethod
+    def from_arrays(cls, jobs: Sequence[Job], machine_ids: np.ndarray, job_ids: np.ndarray, offsets: np.ndarray,
+                    opcodes: np.ndarray, durations: np.ndarray, eligible: List[tuple],
+                    flexibility: np.ndarray) -> 'CompiledInstance':
+        """Build the instance from flat arrays: the operations of job `j` are `offsets[j]` to
+        `offsets[j + 1]` of `opcodes` and `durations`, and `eligible[c]` holds the machine positions
+        of opcode `c`. `jobs` is only indexed when `Job` objects are needed, so it may build them
+        lazily."""
+        instance = cls.__new__(cls)
+        instance.jobs = jobs
+        instance.machine_ids = machine_ids.tolist()
+        bounds = list(zip(offsets[:-1].tolist(), offsets[1:].tolist()))
+        flat = durations.tolist()
+        instance.durations = [flat[lo:hi] for lo, hi in bounds]
+        # Work left from every operation onwards is the job's total minus the work before it.
+        work = np.r_[0, np.cumsum(durations)]
+        remaining = (work[offsets[1:]].repeat(np.diff(offsets)) - work[:-1]).tolist()
+        instance.remaining = [remaining[lo:hi] + [0] for lo, hi in bounds]
+        codes = opcodes.tolist()
+        instance.eligible = [[eligible[c] for c in codes[lo:hi]] for lo, hi in bounds]
+        instance.flexibility = flexibility.tolist()
+        instance.n_ops = len(flat)
+        instance.__dict__.update(job_ids=job_ids, offsets=offsets, opcodes=opcodes)
+        return instance
+
+    # Flat job ids and opcodes for columnar output. `from_arrays` sets them directly; for instances
+    # compiled from `Job` objects they are collected on first use.
+    @cached_property
+    def job_ids(self) -> np.ndarray:
+        return np.fromiter((job.idx for job in self.jobs), dtype=np.int64, count=len(self.jobs))
+
+    @cached_property
+    def offsets(self) -> np.ndarray:
+        return np.r_[0, np.cumsum([len(job) for job in self.jobs], dtype=np.int64)]
+
+    @cached_property
+    def opcodes(self) -> np.ndarray:
+        return np.fromiter((op.opcode for job in self.jobs for op in job), dtype=np.int64, count=self.offsets[-1])
+
+
+def compile_instance(lab: SDLLab, jobs: List[Job]) -> CompiledInstance:
+    return CompiledInstance(lab, jobs)
+
+
+# Priority of job `j` whose step `s` became ready at `ready`; the smallest key is dispatched first.
+DispatchRule = Callable[[CompiledInstance, int, int, int], float]
+
+DISPATCH_RULES = {
+    'FIFO': lambda inst, j, s, ready: ready,
+    'SPT': lambda inst, j, s, ready: inst.durations[j][s],
+    'LPT': lambda inst, j, s, ready: -inst.durations[j][s],
+    'MWKR': lambda inst, j, s, ready: -inst.remaining[j][s],
+    'LWKR': lambda inst, j, s, ready: inst.remaining[j][s],
+    'MOPNR': lambda inst, j, s, ready: s - len(inst.durations[j]),
+}
+
+# Key over the idle machines that can run the operation; the smallest key gets the operation.
+# `earliest_finish` is handled separately since it may also reserve a busy machine.
+MachineRule = Callable[[CompiledInstance, int, List[int]], float]
+
+MACHINE_RULES = {
+    'earliest_finish': None,
+    'first': lambda inst, m, load: m,
+    'least_loaded': lambda inst, m, load: load[m],
+    'least_flexible': lambda inst, m, load: inst.flexibility[m],
+}
+
+
+def dispatch(
+        instance: CompiledInstance,
+        rule: Union[str, DispatchRule] = 'MWKR',
+        machine_rule: Union[str, MachineRule] = 'earliest_finish',
+        columnar: bool = False
+) -> Union[ScheduleResult, ColumnarSchedule]:
+    """Event-driven list scheduling. Time jumps between job-ready and machine-available events;
+    at every event the ready jobs are dispatched in `rule` order. With `earliest_finish` a job
+    is committed right away to the eligible machine that completes it first, even if that machine
+    is still busy. The other machine rules only pick among idle machines and leave the job
+    waiting for the next machine-available event otherwise. With `columnar=True` the schedule is
+    returned as a `ColumnarSchedule` and no `MachineSchedule` objects are created.
+    """
+    priority = DISPATCH_RULES[rule] if isinstance(rule, str) else rule
+    machine_key = MACHINE_RULES[machine_rule] if isinstance(machine_rule, str) else machine_rule
+    reserve = machine_key is None
+    durations, eligible = instance.durations, instance.eligible
+    n_machines = len(instance.machine_ids)
+
+    step = [0] * len(durations)
+    free = [0] * n_machines
+    load = [0] * n_machines
+    idle = set(range(n_machines))
+    Ms = [[] for _ in range(n_machines)]
+    rows = []
+    job_events = [(0, j) for j in range(len(durations)) if durations[j]]
+    machine_events = []
+    # Ready jobs are pooled by the machines that can run their next step, so that jobs waiting
+    # for busy machines are not popped again at every event. The head of every pool is indexed in
+    # `heads` with `earliest_finish` and otherwise under each of its machines in `by_machine`, so
+    # the next job is the smallest head of `heads` or of the idle machines. Entries whose pool head
+    # has changed since are dropped when they reach the top.
+    pools = {}
+    heads = []
+    by_machine = [[] for _ in range(n_machines)]
+    now, makespan = 0, 0
+
+    def index_head(group):
+        entry = (pools[group][0], group)
+        if reserve:
+            heapq.heappush(heads, entry)
+        else:
+            for k in group:
+                heapq.heappush(by_machine[k], entry)
+
+    def top(index):
+        while index:
+            pool = pools.get(index[0][1])
+            if pool is not None and pool[0] is index[0][0]:
+                return index[0]
+            heapq.heappop(index)
+        return None
+
+    while job_events or pools:
+        while job_events and job_events[0][0] <= now:
+            ready, j = heapq.heappop(job_events)
+            group = eligible[j][step[j]]
+            entry = (priority(instance, j, step[j], ready), j)
+            pool = pools.setdefault(group, [])
+            heapq.heappush(pool, entry)
+            if pool[0] is entry:
+                index_head(group)
+        while machine_events and machine_events[0][0] <= now:
+            t, m = heapq.heappop(machine_events)
+            if free[m] == t:
+                idle.add(m)
+
+        while reserve or idle:
+            if reserve:
+                best = top(heads)
+            else:
+                best = None
+                for k in idle:
+                    head = top(by_machine[k])
+                    if head is not None and (best is None or head < best):
+                        best = head
+            if best is None:
+                break
+            group = best[1]
+            pool = pools[group]
+            _, j = heapq.heappop(pool)
+            if pool:
+                index_head(group)
+            else:
+                del pools[group]
+            s = step[j]
+            if reserve:
+                m = min(group, key=free.__getitem__)  # groups are sorted, so ties go to the first machine
+            else:
+                m = min((k for k in group if k in idle), key=lambda k: (machine_key(instance, k, load), k))
+            start = max(now, free[m])
+            end = start + durations[j][s]
+            if columnar:
+                rows.append((j, s, m, start, end))
+            else:
+                Ms[m].append(MachineSchedule(instance.jobs[j].idx, s, instance.jobs[j].ops[s], start, end))
+            free[m] = end
+            load[m] += durations[j][s]
+            idle.discard(m)
+            heapq.heappush(machine_events, (end, m))
+            step[j] += 1
+            if step[j] < len(durations[j]):
+                heapq.heappush(job_events, (end, j))
+            makespan = max(makespan, end)
+
+        upcoming = [events[0][0] for events in (job_events, machine_events) if events]
+        if upcoming:
+            now = max(now, min(upcoming))
+
+    if columnar:
+        table = np.array(rows, dtype=np.int64).reshape(-1, 5)
+        columns = np.empty(len(table), dtype=SCHEDULE_DTYPE)
+        columns['job'] = instance.job_ids[table[:, 0]]
+        columns['step'] = table[:, 1]
+        columns['machine'] = np.asarray(instance.machine_ids, dtype=np.int64)[table[:, 2]]
+        columns['opcode'] = instance.opcodes[instance.offsets[table[:, 0]] + table[:, 1]]
+        columns['start'] = table[:, 3]
+        columns['end'] = table[:, 4]
+        return ColumnarSchedule(makespan, columns)
+
+    machine_schedules = {instance.machine_ids[m]: slots for m, slots in enumerate(Ms)}
+    return ScheduleResult(makespan=makespan, machine_schedules=machine_schedules,
+                          job_schedules=job_schedules_from(machine_schedules, instance.jobs))
+
+
+def solve(lab: SDLLab, jobs: List[Job], rule: Union[str, DispatchRule] = 'MWKR',
+          machine_rule: Union[str, MachineRule] = 'earliest_finish',
+          columnar: bool = False) -> Union[ScheduleResult, ColumnarSchedule]:
+    return dispatch(compile_instance(lab, jobs), rule, machine_rule, columnar)
@@ -1,7 +1,8 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from sdl.lab import SDLLab, Job, Operation, Machine, MachineSchedule
 from dataclasses import dataclass, field
 import numpy as np
+from time import perf_counter
 
 
 @dataclass(frozen=True)
@@ -86,6 +87,17 @@ class Individual:
                                                                    self.jobs)
         self.valid = True
 
+    def copy(self):
+        """Copy the individual without decoding the chromosome again."""
+        other = Individual.__new__(Individual)
+        other.chromosome = Chromosome(self.chromosome.machine_selection.copy(),
+                                      self.chromosome.operation_sequence.copy())
+        other.lab = self.lab
+        other.jobs = self.jobs
+        other.fitness, other.SJs, other.Ms = self.fitness, self.SJs, self.Ms
+        other.valid = self.valid
+        return other
+
     @classmethod
     def create_random_chromosome(cls, lab: SDLLab, jobs: List[Job], random_state: np.random.RandomState):
         machine_selection = []
@@ -185,9 +197,11 @@ class Individual:
 def genetic_solve(
         lab: SDLLab, jobs: List[Job], random_state: np.random.RandomState,
         initial_population: List[Individual] = None, population_size: int = 100,
-        max_generations: int = 1000, mutation_rate: float = 0.1, crossover_rate: float = 0.9
+        max_generations: int = 1000, mutation_rate: float = 0.1, crossover_rate: float = 0.9,
+        time_limit: Optional[float] = None
 ):
-    """Solve the problem using genetic algorithm."""
+    """Solve the problem using genetic algorithm. Stops early after `time_limit` seconds if given."""
+    deadline = None if time_limit is None else perf_counter() + time_limit
     if initial_population is None:
         population = [Individual.create_random_chromosome(lab, jobs, random_state) for _ in range(population_size)]
     else:
@@ -204,6 +218,8 @@ def genetic_solve(
     fitness_history = [best_fitness]
 
     for generation in range(max_generations):
+        if deadline is not None and perf_counter() >= deadline:
+            break
         population.sort(key=lambda x: x.fitness)
         if population[0].fitness < best_fitness:
             best_individual = population[0]
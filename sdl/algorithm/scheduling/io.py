@@ -1,5 +1,12 @@
+import numpy as np
+
 from dataclasses import dataclass, field
-from sdl.lab import MachineSchedule
+from sdl.lab import MachineSchedule, SDLLab, Job
+
+SCHEDULE_DTYPE = np.dtype([
+    ('job', np.int32), ('step', np.int32), ('machine', np.int32),
+    ('opcode', np.int32), ('start', np.int64), ('end', np.int64)
+])
 
 @dataclass(frozen=True)
 class SchedulingDecisions:
@@ -14,4 +21,104 @@ class SchedulingDecisions:
 class ScheduleResult:
     makespan: int
     machine_schedules: dict[int, list[MachineSchedule]]
-    job_schedules: dict[int, list[tuple[int, int]]]
\ No newline at end of file
+    job_schedules: dict[int, list[tuple[int, int]]]
+
+class ColumnarSchedule:
+    """
+    Array-backed schedule: one `SCHEDULE_DTYPE` row (job idx, step, machine idx, opcode, start,
+    end) per scheduled step, sorted by machine and start time. `machine(idx)` is a slice of the
+    rows, i.e. a view, and `job(idx)` gathers the rows of a job in step order through the
+    `job_order` permutation. Pickling only sends the makespan and the rows.
+    """
+
+    def __init__(self, makespan: int, rows: np.ndarray):
+        order = np.lexsort((rows['start'], rows['machine']))
+        self.makespan = int(makespan)
+        self.rows = rows[order]
+        self.machine_ids, first = np.unique(self.rows['machine'], return_index=True)
+        self._machine_bounds = np.r_[first, len(self.rows)]
+        self.job_order = np.lexsort((self.rows['step'], self.rows['job']))
+        self.job_ids, first = np.unique(self.rows['job'][self.job_order], return_index=True)
+        self._job_bounds = np.r_[first, len(self.rows)]
+
+    def __reduce__(self):
+        return ColumnarSchedule, (self.makespan, self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def machine(self, machine_id: int) -> np.ndarray:
+        k = np.searchsorted(self.machine_ids, machine_id)
+        if k == len(self.machine_ids) or self.machine_ids[k] != machine_id:
+            return self.rows[:0]
+        return self.rows[self._machine_bounds[k]:self._machine_bounds[k + 1]]
+
+    def job_rows(self, job_id: int) -> np.ndarray:
+        """Positions in `rows` of the steps of a job, in step order."""
+        k = np.searchsorted(self.job_ids, job_id)
+        if k == len(self.job_ids) or self.job_ids[k] != job_id:
+            return self.job_order[:0]
+        return self.job_order[self._job_bounds[k]:self._job_bounds[k + 1]]
+
+    def job(self, job_id: int) -> np.ndarray:
+        return self.rows[self.job_rows(job_id)]
+
+    @classmethod
+    def from_result(cls, result: ScheduleResult) -> 'ColumnarSchedule':
+        n = sum(len(slots) for slots in result.machine_schedules.values())
+        rows = np.empty(n, dtype=SCHEDULE_DTYPE)
+        if n:
+            rows[:] = [(slot.job_id, slot.job_step, machine_id, slot.operation.opcode, slot.start_time, slot.end_time)
+                       for machine_id, slots in result.machine_schedules.items() for slot in slots]
+        return cls(result.makespan, rows)
+
+    def to_result(self, lab: SDLLab, jobs: list[Job]) -> ScheduleResult:
+        """Rebuild the object-based `ScheduleResult`, taking the operations from `jobs`."""
+        by_idx = {job.idx: job for job in jobs}
+        Ms = {machine.idx: [] for machine in lab.machines}
+        for job_id, step, machine_id, _, start, end in self.rows.tolist():
+            Ms.setdefault(machine_id, []).append(MachineSchedule(job_id, step, by_idx[job_id].ops[step], start, end))
+        return ScheduleResult(makespan=self.makespan, machine_schedules=Ms, job_schedules=job_schedules_from(Ms, jobs))
+
+
+@dataclass(frozen=True)
+class SchedulingInstance:
+    lab: SDLLab
+    jobs: list[Job]
+
+
+def result_from_indexed_schedule(makespan: int, machine_schedules: list[list[MachineSchedule]],
+                                 jobs: list[Job]) -> ScheduleResult:
+    """Convert the list-based output of `genetic_solve` and `list_scheduling.solve`, where
+    `machine_schedules[i]` belongs to machine `i + 1` and `MachineSchedule.job_id` is the
+    position of the job in `jobs`."""
+    Ms = {
+        i + 1: [MachineSchedule(jobs[slot.job_id].idx, slot.job_step, slot.operation, slot.start_time, slot.end_time)
+                for slot in slots]
+        for i, slots in enumerate(machine_schedules)
+    }
+    return ScheduleResult(makespan=makespan, machine_schedules=Ms, job_schedules=job_schedules_from(Ms, jobs))
+
+
+def result_from_decisions(decisions: SchedulingDecisions, lab: SDLLab, jobs: list[Job]) -> ScheduleResult:
+    """Convert the ILP decision variables of `opt.solve` into a `ScheduleResult`."""
+    x, s, c = decisions.machine_operations, decisions.starting_times, decisions.completion_times
+    if decisions.makespan is None or any(value is None for value in x.values()):
+        raise ValueError("The ILP solver did not return a schedule.")
+    Ms = {machine.idx: [] for machine in lab.machines}
+    for (j, o, m), value in x.items():
+        if round(value) == 1:
+            Ms[m].append(MachineSchedule(jobs[j].idx, o, jobs[j].ops[o], round(s[j, o, m]), round(c[j, o, m])))
+    for slots in Ms.values():
+        slots.sort(key=lambda slot: slot.start_time)
+    return ScheduleResult(makespan=round(decisions.makespan), machine_schedules=Ms,
+                          job_schedules=job_schedules_from(Ms, jobs))
+
+
+def job_schedules_from(machine_schedules: dict[int, list[MachineSchedule]],
+                       jobs: list[Job]) -> dict[int, list[tuple[int, int]]]:
+    SJs = {job.idx: [(-1, 0) for _ in job] for job in jobs}
+    for machine_id, slots in machine_schedules.items():
+        for slot in slots:
+            SJs[slot.job_id][slot.job_step] = (machine_id, slot.start_time)
+    return SJs
@@ -0,0 +1,59 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from sdl.algorithm.scheduling.dispatch import CompiledInstance, DISPATCH_RULES, MACHINE_RULES, compile_instance, dispatch
+from sdl.algorithm.scheduling.io import ScheduleResult
+from sdl.lab import Job, SDLLab
+from typing import List, Optional, Tuple
+
+# Set by `_init_worker` so that the compiled instance is only sent once to each process.
+_worker_instance: Optional[CompiledInstance] = None
+
+
+@dataclass(frozen=True)
+class PortfolioResult:
+    best: ScheduleResult
+    best_rule: Tuple[str, str]
+    makespans: dict[tuple[str, str], int]
+
+
+def _init_worker(instance: CompiledInstance):
+    global _worker_instance
+    _worker_instance = instance
+
+
+def _run_batch(combinations: List[Tuple[str, str]]):
+    return [(combination, dispatch(_worker_instance, *combination).makespan) for combination in combinations]
+
+
+def evaluate_portfolio(
+        lab: SDLLab,
+        jobs: List[Job],
+        rules: Optional[List[str]] = None,
+        machine_rules: Optional[List[str]] = None,
+        n_workers: int = 1
+) -> PortfolioResult:
+    """Run every (dispatch rule, machine rule) combination on one compiled instance and keep the
+    schedule with the smallest makespan. With `n_workers > 1` the combinations are split into one
+    batch per worker process; workers only send back makespans and the winner is re-run locally.
+    """
+    rules = list(DISPATCH_RULES) if rules is None else rules
+    machine_rules = list(MACHINE_RULES) if machine_rules is None else machine_rules
+    combinations = [(rule, machine_rule) for rule in rules for machine_rule in machine_rules]
+    instance = compile_instance(lab, jobs)
+
+    if n_workers <= 1:
+        best_result, best_rule, makespans = None, None, {}
+        for combination in combinations:
+            result = dispatch(instance, *combination)
+            makespans[combination] = result.makespan
+            if best_result is None or result.makespan < best_result.makespan:
+                best_result, best_rule = result, combination
+        return PortfolioResult(best=best_result, best_rule=best_rule, makespans=makespans)
+
+    batches = [combinations[k::n_workers] for k in range(n_workers) if combinations[k::n_workers]]
+    makespans = {}
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(instance,)) as pool:
+        for batch in pool.map(_run_batch, batches):
+            makespans.update(batch)
+    best_rule = min(combinations, key=makespans.__getitem__)
+    return PortfolioResult(best=dispatch(instance, *best_rule), best_rule=best_rule, makespans=makespans)
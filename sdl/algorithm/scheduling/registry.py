@@ -0,0 +1,151 @@
+import multiprocessing
+import queue
+
+from numpy.random import RandomState
+from sdl.algorithm.scheduling import (annealing, beam_search, dispatch, dummy_heuristic, genetic, grasp,
+                                      list_scheduling, opt, portfolio, simple_greedy)
+from sdl.algorithm.scheduling.io import (ColumnarSchedule, ScheduleResult, SchedulingInstance, result_from_decisions,
+                                         result_from_indexed_schedule)
+from sdl.verify import verify_schedule
+from time import perf_counter
+from typing import Callable, Dict, Iterable, Optional
+
+# A solver takes an instance and an optional time budget in seconds. Solvers that cannot stop
+# early ignore the budget.
+Solver = Callable[..., ScheduleResult]
+
+SOLVERS: Dict[str, Solver] = {}
+
+
+def register(name: str):
+    def decorator(fn: Solver) -> Solver:
+        SOLVERS[name] = fn
+        return fn
+
+    return decorator
+
+
+def get_solver(name: str) -> Solver:
+    if name not in SOLVERS:
+        raise KeyError(f"Unknown solver '{name}', available solvers: {sorted(SOLVERS)}")
+    return SOLVERS[name]
+
+
+def solve(name: str, instance: SchedulingInstance, budget: Optional[float] = None, **options) -> ScheduleResult:
+    return get_solver(name)(instance, budget, **options)
+
+
+@register('greedy')
+def _greedy(instance: SchedulingInstance, budget: Optional[float] = None) -> ScheduleResult:
+    return simple_greedy.solve(instance.lab, instance.jobs)
+
+
+@register('list_scheduling')
+def _list_scheduling(instance: SchedulingInstance, budget: Optional[float] = None) -> ScheduleResult:
+    makespan, _, Ms = list_scheduling.solve(instance.lab, instance.jobs)
+    return result_from_indexed_schedule(makespan, Ms, instance.jobs)
+
+
+@register('dummy_heuristic')
+def _dummy_heuristic(instance: SchedulingInstance, budget: Optional[float] = None) -> ScheduleResult:
+    return dummy_heuristic.solve(instance.lab, instance.jobs)
+
+
+@register('grasp')
+def _grasp(instance: SchedulingInstance, budget: Optional[float] = None) -> ScheduleResult:
+    return grasp.solve(instance.lab, instance.jobs)
+
+
+@register('beam_search')
+def _beam_search(instance: SchedulingInstance, budget: Optional[float] = None,
+                 beam_width: int = 8) -> ScheduleResult:
+    return beam_search.solve(instance.lab, instance.jobs, beam_width=beam_width)
+
+
+@register('dispatch')
+def _dispatch(instance: SchedulingInstance, budget: Optional[float] = None, rule: str = 'MWKR',
+              machine_rule: str = 'earliest_finish') -> ScheduleResult:
+    return dispatch.solve(instance.lab, instance.jobs, rule, machine_rule)
+
+
+@register('portfolio')
+def _portfolio(instance: SchedulingInstance, budget: Optional[float] = None, n_workers: int = 1) -> ScheduleResult:
+    return portfolio.evaluate_portfolio(instance.lab, instance.jobs, n_workers=n_workers).best
+
+
+@register('genetic')
+def _genetic(instance: SchedulingInstance, budget: Optional[float] = None,
+             random_state: Optional[RandomState] = None, **options) -> ScheduleResult:
+    random_state = RandomState() if random_state is None else random_state
+    makespan, _, Ms, _, _ = genetic.genetic_solve(instance.lab, instance.jobs, random_state, time_limit=budget,
+                                                  **options)
+    return result_from_indexed_schedule(makespan, Ms, instance.jobs)
+
+
+@register('annealing')
+def _annealing(instance: SchedulingInstance, budget: Optional[float] = None,
+               random_state: Optional[RandomState] = None, **options) -> ScheduleResult:
+    random_state = RandomState() if random_state is None else random_state
+    makespan, _, Ms, _, _ = annealing.anneal_solve(instance.lab, instance.jobs, random_state, time_limit=budget,
+                                                   **options)
+    return result_from_indexed_schedule(makespan, Ms, instance.jobs)
+
+
+@register('ilp')
+def _ilp(instance: SchedulingInstance, budget: Optional[float] = None, **options) -> ScheduleResult:
+    decisions = opt.solve(instance.lab, instance.jobs, time_limit=budget, **options)
+    return result_from_decisions(decisions, instance.lab, instance.jobs)
+
+
+def _race_worker(name: str, instance: SchedulingInstance, budget: float, results: multiprocessing.Queue):
+    try:
+        # Columnar schedules are much cheaper to pickle than lists of `MachineSchedule`.
+        results.put((name, ColumnarSchedule.from_result(solve(name, instance, budget)), None))
+    except Exception as e:
+        results.put((name, None, repr(e)))
+
+
+def race(
+        instance: SchedulingInstance,
+        budget: float,
+        solvers: Iterable[str] = ('ilp', 'genetic', 'grasp', 'greedy'),
+        margin: float = 0.1
+) -> ScheduleResult:
+    """Run several solvers concurrently, each in its own process, and return the best verified
+    schedule available when `budget` seconds have passed. Solvers get `(1 - margin) * budget`
+    so that anytime solvers report back before the deadline; the others are terminated."""
+    ctx = multiprocessing.get_context()
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=_race_worker, args=(name, instance, budget * (1 - margin), results), daemon=True)
+        for name in solvers
+    ]
+    deadline = perf_counter() + budget
+    for process in processes:
+        process.start()
+
+    best = None
+    for _ in processes:
+        try:
+            name, result, error = results.get(timeout=max(deadline - perf_counter(), 0))
+        except queue.Empty:
+            break
+        if result is None or verify_schedule(result, instance.lab, instance.jobs):
+            continue
+        if best is None or result.makespan < best.makespan:
+            best = result
+
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+    if best is None:
+        raise RuntimeError(f"No solver returned a valid schedule within {budget} seconds.")
+    return best.to_result(instance.lab, instance.jobs)
+
+
+@register('race')
+def _race(instance: SchedulingInstance, budget: Optional[float] = None, **options) -> ScheduleResult:
+    if budget is None:
+        raise ValueError("Racing solvers requires a time budget.")
+    return race(instance, budget, **options)
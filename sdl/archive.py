@@ -0,0 +1,133 @@
+import glob
+import json
+import os
+import struct
+
+import numpy as np
+import pandas as pd
+
+from sdl.algorithm.scheduling.io import SCHEDULE_DTYPE, ColumnarSchedule
+from typing import Any, Dict, Iterable, List, Optional
+
+MAGIC = b'SDLARCH1'
+ALIGNMENT = 64
+ARCHIVE_SUFFIX = '.sdla'
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable.")
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_archive(path: str, meta: Dict[str, Any], schedule: Optional[ColumnarSchedule] = None,
+                  arrays: Optional[Dict[str, np.ndarray]] = None):
+    """
+    Write an archive: the magic bytes, the header length as a little-endian uint64, a JSON header
+    with `meta` and the location of every array section, and the sections themselves, each
+    aligned to 64 bytes so that they can be memory-mapped. The schedule rows are stored sorted by
+    machine and the header indexes the row range of every machine.
+    """
+    sections = dict(arrays or {})
+    machines = {}
+    if schedule is not None:
+        sections['schedule'] = schedule.rows
+        lo = np.searchsorted(schedule.rows['machine'], schedule.machine_ids, side='left').tolist()
+        hi = np.searchsorted(schedule.rows['machine'], schedule.machine_ids, side='right').tolist()
+        machines = {str(m): [lo[k], hi[k]] for k, m in enumerate(schedule.machine_ids.tolist())}
+    sections = {name: np.ascontiguousarray(array) for name, array in sections.items()}
+
+    def header_bytes(offset):
+        layout, position = {}, offset
+        for name, array in sections.items():
+            position = _aligned(position)
+            layout[name] = {'dtype': array.dtype.descr if array.dtype.names else array.dtype.str,
+                            'shape': list(array.shape), 'offset': position}
+            position += array.nbytes
+        header = {'version': 1, 'meta': meta, 'sections': layout, 'machines': machines}
+        if schedule is not None:
+            header['makespan'] = schedule.makespan
+        return json.dumps(header, default=_json_default).encode()
+
+    # The section offsets depend on the header length, so grow the reserved space until it fits.
+    reserved = ALIGNMENT
+    while True:
+        start = _aligned(len(MAGIC) + 8 + reserved)
+        header = header_bytes(start)
+        if len(header) <= reserved:
+            break
+        reserved = _aligned(len(header))
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', reserved))
+        f.write(header.ljust(reserved))
+        for name, section in json.loads(header)['sections'].items():
+            f.seek(section['offset'])
+            f.write(sections[name].tobytes())
+    os.replace(tmp, path)
+
+
+class ScheduleArchive:
+    """
+    Read side of `write_archive`. Opening an archive reads only the header; array sections are
+    memory-mapped on first use, and `machine(idx)` maps only that machine's rows, so metadata
+    scans and single-timeline reads touch a few pages of the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a schedule archive.")
+            length, = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(length))
+        self.meta: Dict[str, Any] = header['meta']
+        self.sections: Dict[str, dict] = header['sections']
+        self.machines: Dict[int, tuple] = {int(m): tuple(bounds) for m, bounds in header['machines'].items()}
+        self.makespan: Optional[int] = header.get('makespan')
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def _dtype(self, name: str) -> np.dtype:
+        dtype = self.sections[name]['dtype']
+        return np.dtype([tuple(field) for field in dtype] if isinstance(dtype, list) else dtype)
+
+    def array(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            section = self.sections[name]
+            shape = tuple(section['shape'])
+            if np.prod(shape) == 0:
+                self._arrays[name] = np.empty(shape, dtype=self._dtype(name))
+            else:
+                self._arrays[name] = np.memmap(self.path, dtype=self._dtype(name), mode='r',
+                                               offset=section['offset'], shape=shape)
+        return self._arrays[name]
+
+    def machine(self, machine_id: int) -> np.ndarray:
+        """Rows of one machine, read from a memory map of just that range."""
+        lo, hi = self.machines.get(machine_id, (0, 0))
+        if lo == hi:
+            return np.empty(0, dtype=SCHEDULE_DTYPE)
+        itemsize = self._dtype('schedule').itemsize
+        return np.memmap(self.path, dtype=self._dtype('schedule'), mode='r',
+                         offset=self.sections['schedule']['offset'] + lo * itemsize, shape=(hi - lo,))
+
+    def schedule(self) -> ColumnarSchedule:
+        return ColumnarSchedule(self.makespan, np.asarray(self.array('schedule')))
+
+
+def scan_archives(paths: Iterable[str], fields: Optional[List[str]] = None) -> pd.DataFrame:
+    """One row per archive with the requested `meta` fields (all of them by default), reading only
+    the headers. `paths` may contain glob patterns."""
+    rows = []
+    for pattern in paths:
+        for path in sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]:
+            meta = ScheduleArchive(path).meta
+            row = {'path': path}
+            row.update(meta if fields is None else {name: meta.get(name) for name in fields})
+            rows.append(row)
+    return pd.DataFrame(rows)
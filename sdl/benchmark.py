@@ -0,0 +1,336 @@
+"""
+Benchmark harness for the schedulers and partitioners. Every (solver, tier) case runs in its own
+process on a fixed seeded instance and records its wall time, peak resident memory (above the
+memory in use just before the solve, so imports and the instance are left out) and makespan
+to a JSON-lines history file. Results are compared with the last successful run of the same case
+in the history and slowdowns, memory growth or worse makespans beyond a tolerance are flagged:
+
+    python -m sdl.benchmark --tiers tiny small medium --history benchmarks.jsonl
+"""
+import argparse
+import functools
+import json
+import multiprocessing
+import os
+import queue
+import resource
+import subprocess
+import sys
+
+import numpy as np
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from numpy.random import RandomState
+from sdl.algorithm.partition.column_generation import column_generation_partition
+from sdl.algorithm.partition.local_search import improve_partition
+from sdl.algorithm.partition.opt import opt_partition
+from sdl.algorithm.partition.random import multistart_random_partition, random_partition
+from sdl.algorithm.scheduling import registry, simple_greedy
+from sdl.algorithm.scheduling.io import SchedulingInstance
+from sdl.fjsp import load_benchmark
+from sdl.lab import Job, SDLLab
+from sdl.random.bulk import bulk_sdl
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+
+@dataclass(frozen=True)
+class Tier:
+    name: str
+    p: int
+    m: int
+    n: int
+    o: int
+    steps_min: int
+    steps_max: int
+    seed: int
+    sites: int = 3  # labs the jobs are partitioned over in partitioner cases
+
+
+# About 15, 150, 1.5k, 15k and 100k operations. `steps_max` is exclusive, as in `create_sdl`.
+TIERS: Dict[str, Tier] = {tier.name: tier for tier in (
+    Tier('tiny', p=2, m=3, n=4, o=6, steps_min=3, steps_max=5, seed=1),
+    Tier('small', p=3, m=6, n=20, o=20, steps_min=5, steps_max=11, seed=2),
+    Tier('medium', p=5, m=20, n=200, o=50, steps_min=5, steps_max=11, seed=3),
+    Tier('large', p=10, m=50, n=2_000, o=100, steps_min=5, steps_max=11, seed=4),
+    Tier('xlarge', p=10, m=100, n=13_333, o=200, steps_min=5, steps_max=11, seed=5),
+)}
+# Bundled reference instances from `sdl.fjsp`, benchmarked like a tier.
+REFERENCE_TIERS = ('ft06', 'la01', 'la02', 'la03', 'la04', 'la05')
+
+# Fixed options that make the randomized solvers deterministic for a seed.
+SOLVER_OPTIONS: Dict[str, dict] = {
+    'genetic': {'population_size': 50, 'max_generations': 50},
+    'annealing': {'max_iterations': 20_000},
+}
+
+PARTITIONERS: Dict[str, Callable] = {
+    'partition:random': lambda sites, jobs, seed: random_partition(
+        sites, jobs, simple_greedy.solve, random_state=RandomState(seed)).makespan,
+    'partition:multistart': lambda sites, jobs, seed: multistart_random_partition(
+        sites, jobs, simple_greedy.solve, n_samples=16, seed=seed).best.makespan,
+    'partition:local_search': lambda sites, jobs, seed: improve_partition(
+        sites, jobs, random_partition(sites, jobs, simple_greedy.solve, random_state=RandomState(seed)),
+        simple_greedy.solve, time_limit=None, random_state=RandomState(seed)).makespan,
+    'partition:column_generation': lambda sites, jobs, seed: column_generation_partition(
+        sites, jobs, simple_greedy.solve).makespan,
+    'partition:opt': lambda sites, jobs, seed: opt_partition(sites, jobs, simple_greedy.solve).makespan,
+}
+
+# Largest tier every solver is run on by default; larger ones would take too long.
+MAX_TIER: Dict[str, str] = {
+    'greedy': 'xlarge',
+    'list_scheduling': 'xlarge',
+    'dummy_heuristic': 'xlarge',
+    'dispatch': 'xlarge',
+    'portfolio': 'large',
+    'grasp': 'medium',
+    'beam_search': 'small',
+    'genetic': 'small',
+    'annealing': 'small',
+    'ilp': 'tiny',
+    'partition:random': 'xlarge',
+    'partition:multistart': 'large',
+    'partition:local_search': 'small',
+    'partition:column_generation': 'small',
+    'partition:opt': 'small',
+}
+SOLVERS = list(MAX_TIER)
+
+
+@dataclass(frozen=True)
+class Regression:
+    case: str
+    metric: str
+    baseline: float
+    value: float
+
+    def __str__(self) -> str:
+        return f'{self.case}: {self.metric} {self.baseline:g} -> {self.value:g}'
+
+
+def default_cases(tiers: List[str], solvers: Optional[List[str]] = None) -> List[Tuple[str, str]]:
+    """The (solver, tier) pairs among `tiers` that are within each solver's `MAX_TIER`; reference
+    instances are scheduled by every scheduler but not partitioned."""
+    order = list(TIERS)
+    cases = []
+    for solver in solvers or SOLVERS:
+        for tier in tiers:
+            if tier in REFERENCE_TIERS:
+                if not solver.startswith('partition:'):
+                    cases.append((solver, tier))
+            elif order.index(tier) <= order.index(MAX_TIER.get(solver, 'xlarge')):
+                cases.append((solver, tier))
+    return cases
+
+
+def tier_instance(name: str) -> Tuple[SDLLab, List[Job]]:
+    if name in REFERENCE_TIERS:
+        instance = load_benchmark(name)
+        return instance.lab, instance.jobs
+    tier = TIERS[name]
+    instance = bulk_sdl(tier.p, tier.m, tier.n, tier.o, tier.steps_min, tier.steps_max, RandomState(tier.seed))
+    return instance.lab, list(instance.jobs)
+
+
+def tier_sites(name: str) -> Tuple[List[SDLLab], List[Job]]:
+    """`sites` labs over the same opcodes, each with its own machines and durations; the jobs come
+    from the first one. Every lab can perform every job."""
+    tier = TIERS[name]
+    instances = [bulk_sdl(tier.p, tier.m, tier.n, tier.o, tier.steps_min, tier.steps_max, RandomState(tier.seed + k))
+                 for k in range(tier.sites)]
+    return [instance.lab for instance in instances], list(instances[0].jobs)
+
+
+def _proc_status_mb(field: str) -> Optional[float]:
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / (1 << 10)
+    except OSError:
+        pass
+    return None
+
+
+def _peak_memory_mb() -> float:
+    # `VmHWM` is reset by exec, while `ru_maxrss` keeps the peak of the forked parent on Linux.
+    peak = _proc_status_mb('VmHWM')
+    if peak is not None:
+        return peak
+    # `ru_maxrss` is in kilobytes on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / (1 << 10)
+
+
+def _memory_mb() -> float:
+    # Current resident memory where /proc is available, otherwise the peak so far.
+    memory = _proc_status_mb('VmRSS')
+    return memory if memory is not None else _peak_memory_mb()
+
+
+def _can_reset_peak_memory() -> bool:
+    return os.access('/proc/self/clear_refs', os.W_OK)
+
+
+def _reset_peak_memory():
+    # Writing 5 to `clear_refs` resets `VmHWM` to the current resident memory (Linux only).
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+
+
+def _case_instance(solver: str, tier: str) -> Tuple[Union[SDLLab, List[SDLLab]], List[Job]]:
+    return tier_sites(tier) if solver.startswith('partition:') else tier_instance(tier)
+
+
+def _run_case(solver: str, tier: str, results: multiprocessing.Queue, instance: Optional[tuple] = None):
+    try:
+        seed = TIERS[tier].seed if tier in TIERS else 0
+        # Some solvers, e.g. `dummy_heuristic`, draw from numpy's global generator.
+        np.random.seed(seed)
+        if instance is None:
+            instance = _case_instance(solver, tier)
+        lab, jobs = instance
+        n_ops = sum(len(job) for job in jobs)
+        if solver.startswith('partition:'):
+            solve = functools.partial(PARTITIONERS[solver], lab, jobs, seed)
+        else:
+            options = dict(SOLVER_OPTIONS.get(solver, {}))
+            if solver in ('genetic', 'annealing'):
+                options['random_state'] = RandomState(seed)
+            solve = lambda: registry.solve(solver, SchedulingInstance(lab, jobs), **options).makespan
+        # Only the memory of the solve is measured, not the peak of building the instance.
+        if _can_reset_peak_memory():
+            _reset_peak_memory()
+        baseline = _memory_mb()
+        start = perf_counter()
+        makespan = solve()
+        wall_time = perf_counter() - start
+        results.put({'status': 'ok', 'n_ops': n_ops, 'wall_time': wall_time,
+                     'peak_memory_mb': max(_peak_memory_mb() - baseline, 0.0), 'makespan': int(round(makespan))})
+    except Exception as e:
+        results.put({'status': 'error', 'error': repr(e)})
+
+
+def run_case(solver: str, tier: str, timeout: Optional[float] = None) -> dict:
+    """Run one case in a freshly spawned process, so that its peak memory does not include the
+    memory of the caller or of other cases, and terminate it after `timeout` seconds. A process
+    that dies without reporting back, e.g. killed for memory, is recorded as an error. Where the
+    peak memory of a process cannot be reset, the instance is built here and sent to the case
+    process, so that building it does not count towards the peak."""
+    ctx = multiprocessing.get_context('spawn')
+    results = ctx.Queue()
+    instance = None if _can_reset_peak_memory() else _case_instance(solver, tier)
+    process = ctx.Process(target=_run_case, args=(solver, tier, results, instance), daemon=True)
+    process.start()
+    deadline = perf_counter() + timeout if timeout is not None else float('inf')
+    while True:
+        try:
+            record = results.get(timeout=min(max(deadline - perf_counter(), 0.0), 0.5))
+            break
+        except queue.Empty:
+            pass
+        if not process.is_alive():
+            try:
+                record = results.get(timeout=1)
+            except queue.Empty:
+                record = {'status': 'error', 'error': f'Benchmark process exited with code {process.exitcode}.'}
+            break
+        if perf_counter() >= deadline:
+            record = {'status': 'timeout'}
+            break
+    if process.is_alive():
+        process.terminate()
+    process.join()
+    return {'case': f'{solver}/{tier}', 'solver': solver, 'tier': tier, **record}
+
+
+def read_history(path: str) -> List[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baselines(history: List[dict]) -> Dict[str, dict]:
+    """The last successful record of every case."""
+    return {record['case']: record for record in history if record.get('status') == 'ok'}
+
+
+def find_regressions(records: List[dict], baseline: Dict[str, dict], tolerance: float = 0.2,
+                     makespan_tolerance: float = 0.0, min_time: float = 0.05,
+                     min_memory_mb: float = 8.0) -> List[Regression]:
+    """Cases that got slower or used more memory by more than `tolerance` (relative) and more
+    than `min_time` seconds or `min_memory_mb` (absolute, to ignore noise on tiny cases), found
+    a makespan more than `makespan_tolerance` worse, or stopped finishing."""
+    regressions = []
+    for record in records:
+        base = baseline.get(record['case'])
+        if base is None:
+            continue
+        if record['status'] != 'ok':
+            regressions.append(Regression(record['case'], record['status'], base['wall_time'], float('nan')))
+            continue
+        for metric, floor, relative in (('wall_time', min_time, tolerance),
+                                        ('peak_memory_mb', min_memory_mb, tolerance),
+                                        ('makespan', 0, makespan_tolerance)):
+            value, before = record[metric], base[metric]
+            if value > before * (1 + relative) and value - before > floor:
+                regressions.append(Regression(record['case'], metric, before, value))
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_benchmarks(cases: List[Tuple[str, str]], history: Optional[str] = None, timeout: Optional[float] = 600,
+                   tolerance: float = 0.2, makespan_tolerance: float = 0.0,
+                   log: Optional[Callable[[str], None]] = print) -> Tuple[List[dict], List[Regression]]:
+    """Run `cases`, compare them with the baselines in `history` and append them to it."""
+    baseline = baselines(read_history(history)) if history else {}
+    stamp = {'time': datetime.now(timezone.utc).isoformat(timespec='seconds'), 'commit': _git_commit()}
+    records = []
+    for solver, tier in cases:
+        record = {**stamp, **run_case(solver, tier, timeout)}
+        records.append(record)
+        if log is not None:
+            if record['status'] == 'ok':
+                log(f"{record['case']:<40} {record['wall_time']:>9.3f}s {record['peak_memory_mb']:>9.1f}MB "
+                    f"makespan {record['makespan']}")
+            else:
+                log(f"{record['case']:<40} {record['status']} {record.get('error', '')}")
+    regressions = find_regressions(records, baseline, tolerance, makespan_tolerance)
+    if history:
+        with open(history, 'a') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+    return records, regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m sdl.benchmark', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tiers', nargs='+', default=['tiny', 'small', 'medium', 'ft06'],
+                        choices=list(TIERS) + list(REFERENCE_TIERS))
+    parser.add_argument('--solvers', nargs='+', default=None, choices=SOLVERS)
+    parser.add_argument('--history', default='benchmarks.jsonl', help='JSON-lines history file')
+    parser.add_argument('--timeout', type=float, default=600, help='seconds per case')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='relative time and memory tolerance')
+    parser.add_argument('--makespan-tolerance', type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    _, regressions = run_benchmarks(default_cases(args.tiers, args.solvers), args.history, args.timeout,
+                                    args.tolerance, args.makespan_tolerance, functools.partial(print, flush=True))
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+import json
+import os
+
+from dataclasses import dataclass
+from sdl.lab import Job, Machine, SDLLab, intern_operation
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(__file__), 'benchmarks')
+
+# How to turn the machine-dependent processing times of one FJSP operation into the single
+# per-opcode duration of `SDLLab`. 'max' keeps schedules feasible for the original times.
+DURATION_POLICIES: Dict[str, Callable[[List[int]], int]] = {
+    'max': max,
+    'min': min,
+    'mean': lambda times: round(sum(times) / len(times)),
+}
+
+FJSPOperation = List[Tuple[int, int]]  # (machine number, processing time) pairs, machines from 1
+
+
+@dataclass(frozen=True)
+class FJSPInstance:
+    name: str
+    lab: SDLLab
+    jobs: List[Job]
+    # Best-known makespan of the original instance; only set where it is also that of the lab.
+    best_known: Optional[int] = None
+
+
+def _tokens(lines: TextIO) -> Iterator[int]:
+    for line in lines:
+        for token in line.split():
+            yield int(float(token))
+
+
+def iter_fjs(lines: TextIO) -> Tuple[int, int, Iterator[List[FJSPOperation]]]:
+    """
+    Streaming parser for the flexible job-shop text format used by the Brandimarte, Hurink and
+    Dauzère-Pérès sets: a header `n_jobs n_machines [avg machines per operation]`, then per job
+    the number of operations followed, per operation, by the number of eligible machines and
+    that many `machine time` pairs. Returns the job and machine counts and an iterator over the
+    jobs, which reads the file as it goes.
+    """
+    header = ''
+    while not header.strip():
+        header = next(lines)
+    n_jobs, n_machines = (int(float(token)) for token in header.split()[:2])
+    tokens = _tokens(lines)
+
+    def jobs():
+        for _ in range(n_jobs):
+            operations = []
+            for _ in range(next(tokens)):
+                k = next(tokens)
+                operations.append([(next(tokens), next(tokens)) for _ in range(k)])
+            yield operations
+
+    return n_jobs, n_machines, jobs()
+
+
+def read_fjs(path: str, policy: str = 'max', name: Optional[str] = None) -> FJSPInstance:
+    """
+    Read an `.fjs` file into an `SDLLab` and its jobs. Every distinct pair of (eligible machines,
+    collapsed duration) becomes one opcode, so the lab keeps the routing flexibility of the
+    instance exactly and only the processing times are collapsed with `policy`.
+    """
+    collapse = DURATION_POLICIES[policy]
+    opcodes: Dict[Tuple[Tuple[int, ...], int], int] = {}
+    jobs = []
+    with open(path) as f:
+        n_jobs, n_machines, fjs_jobs = iter_fjs(f)
+        machine_ops: Dict[int, set] = {m: set() for m in range(1, n_machines + 1)}
+        for j, fjs_job in enumerate(fjs_jobs):
+            ops = []
+            for pairs in fjs_job:
+                machines = tuple(sorted({m for m, _ in pairs}))
+                duration = collapse([time for _, time in pairs])
+                opcode = opcodes.setdefault((machines, duration), len(opcodes) + 1)
+                op = intern_operation(opcode, f'O_{opcode}', duration)
+                for m in machines:
+                    machine_ops[m].add(op)
+                ops.append(op)
+            jobs.append(Job(j + 1, f'J_{j + 1}', ops))
+    machines = [Machine(m, f'M_{m}', ops) for m, ops in machine_ops.items()]
+    operations = {op for ops in machine_ops.values() for op in ops}
+    lab = SDLLab(machines, operations, {op.opcode: op.duration for op in operations})
+    return FJSPInstance(name or os.path.splitext(os.path.basename(path))[0], lab, jobs)
+
+
+def write_fjs(path: str, lab: SDLLab, jobs: List[Job]):
+    """Write a lab and its jobs in the `.fjs` format, one job per line. Machines are numbered by
+    their position in `lab.machines`, starting at 1."""
+    number = {machine.idx: m + 1 for m, machine in enumerate(lab.machines)}
+    n_ops = sum(len(job) for job in jobs)
+    n_pairs = sum(len(lab.op_to_machine_ids[op.opcode]) for job in jobs for op in job)
+    with open(path, 'w') as f:
+        f.write(f'{len(jobs)}\t{len(lab.machines)}\t{n_pairs / max(n_ops, 1):g}\n')
+        for job in jobs:
+            fields = [len(job)]
+            for op in job:
+                machines = sorted(number[m] for m in lab.op_to_machine_ids[op.opcode])
+                fields.append(len(machines))
+                for m in machines:
+                    fields.extend((m, lab.proc_time(op.opcode)))
+            f.write('\t'.join(map(str, fields)) + '\n')
+
+
+def benchmark_manifest(directory: str = BENCHMARK_DIR) -> Dict[str, dict]:
+    with open(os.path.join(directory, 'manifest.json')) as f:
+        return json.load(f)
+
+
+def load_benchmark(name: str, policy: str = 'max', directory: str = BENCHMARK_DIR) -> FJSPInstance:
+    """
+    Load a reference instance of the benchmark suite in `directory`, by default the bundled one
+    (ft06 and la01-la05), together with its best-known makespan. The published best-known values
+    of flexible instances (manifest entries with `"flexible": true`, e.g. the Brandimarte and
+    Hurink sets) are for machine-dependent processing times, so they are not comparable with
+    schedules of the collapsed durations and are left out.
+    """
+    entry = benchmark_manifest(directory)[name]
+    instance = read_fjs(os.path.join(directory, entry['file']), policy, name)
+    best_known = None if entry.get('flexible', True) else entry.get('best_known')
+    return FJSPInstance(instance.name, instance.lab, instance.jobs, best_known)
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+from collections import OrderedDict
+from sdl.lab import Job, Operation, SDLLab
+from typing import List, Optional, Tuple
+
+
+def _operation_key(op: Operation) -> list:
+    return [int(op.opcode), op.name, int(op.duration)]
+
+
+def canonical_instance(lab: SDLLab, jobs: List[Job]) -> dict:
+    """JSON-serializable description of an instance that does not depend on set or dict order."""
+    return {
+        'machines': [[machine.idx, machine.name, sorted(_operation_key(op) for op in machine.ops)]
+                     for machine in sorted(lab.machines, key=lambda machine: machine.idx)],
+        'operations': sorted(_operation_key(op) for op in lab.operations),
+        'durations': sorted([int(opcode), int(duration)] for opcode, duration in lab.durations.items()),
+        'jobs': [[job.idx, job.name, [_operation_key(op) for op in job]] for job in jobs],
+    }
+
+
+def instance_hash(lab: SDLLab, jobs: List[Job]) -> str:
+    encoded = json.dumps(canonical_instance(lab, jobs), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class InstanceStore:
+    """
+    Content-addressed store of (lab, jobs) instances under `root`. An instance is pickled once to
+    `root/<hash[:2]>/<hash>.pkl`, where the hash is taken over its canonical description, so
+    storing the same instance again only returns its key. The last `max_loaded` instances loaded
+    are kept in memory, so runs that reference one of them share the same objects.
+    """
+
+    def __init__(self, root: str, max_loaded: Optional[int] = 64):
+        self.root = root
+        self.max_loaded = max_loaded
+        self._loaded: OrderedDict[str, Tuple[SDLLab, List[Job]]] = OrderedDict()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f'{key}.pkl')
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._loaded or os.path.exists(self.path(key))
+
+    def put(self, lab: SDLLab, jobs: List[Job]) -> str:
+        # Hashed on every call: the caller may have changed the lab or the jobs list since the last one.
+        key = instance_hash(lab, jobs)
+        if key not in self:
+            path = self.path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so that concurrent writers never expose a partial pickle.
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({'machines': lab.machines, 'operation_pool': lab.operations,
+                             'durations': lab.durations, 'jobs': jobs}, f)
+            os.replace(tmp, path)
+        return key
+
+    def get(self, key: str) -> Tuple[SDLLab, List[Job]]:
+        if key in self._loaded:
+            self._loaded.move_to_end(key)
+            return self._loaded[key]
+        with open(self.path(key), 'rb') as f:
+            data = pickle.load(f)
+        lab = SDLLab(data['machines'], data['operation_pool'], data['durations'])
+        instance = self._loaded[key] = (lab, data['jobs'])
+        if self.max_loaded is not None and len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
+        return instance
@@ -1,5 +1,7 @@
+import weakref
+
 from collections import namedtuple
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from numpy.random import randint
 from typing import List, NewType, Set, Dict, Union
 
@@ -10,15 +12,42 @@ MAX_DURATION = 10_000
 OpCode = NewType('OpCode', int)
 
 
-@dataclass(frozen=True)
+def _setstate(self, state):
+    # Pickles written before these classes had slots hold the instance `__dict__` as their state.
+    if isinstance(state, dict):
+        state = [state[f.name] for f in fields(self)]
+    for f, value in zip(fields(self), state):
+        object.__setattr__(self, f.name, value)
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class Operation:
     opcode: Union[OpCode, int]
     name: str
     duration: int = field(default=0)
     # machines: Set[int] = field(default_factory=set)
 
+    def __reduce__(self):
+        # Unpickled operations, e.g. in results sent back by worker processes, are interned too.
+        return intern_operation, (self.opcode, self.name, self.duration)
+
+    __setstate__ = _setstate
+
+
+# Operations are only kept while some lab or job still refers to them.
+_OPERATIONS: 'weakref.WeakValueDictionary[tuple, Operation]' = weakref.WeakValueDictionary()
+
 
-@dataclass(frozen=True)
+def intern_operation(opcode: Union[OpCode, int], name: str, duration: int = 0) -> Operation:
+    """Returns the one shared `Operation` with these fields, creating it on first use."""
+    key = (opcode, name, duration)
+    op = _OPERATIONS.get(key)
+    if op is None:
+        op = _OPERATIONS[key] = Operation(opcode, name, duration)
+    return op
+
+
+@dataclass(frozen=True, slots=True)
 class MachineSchedule:
     job_id: int
     job_step: int
@@ -26,8 +55,10 @@ class MachineSchedule:
     start_time: int
     end_time: int
 
+    __setstate__ = _setstate
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Decision:
     job_id: int
     operation: Operation
@@ -36,23 +67,29 @@ class Decision:
     completion_time: int
     duration: int
 
+    __setstate__ = _setstate
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Machine:
     idx: int
     name: str
     ops: Set[Operation]
 
+    __setstate__ = _setstate
+
     def has_operation(self, op: Operation) -> bool:
         return op in self.ops
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Job:
     idx: int
     name: str
     ops: List[Operation]
 
+    __setstate__ = _setstate
+
     def __iter__(self) -> iter:
         return iter(self.ops)
 
@@ -87,6 +124,7 @@ class SDLLab:
                     if opid not in self.op_to_machine_ids:
                         self.op_to_machine_ids[opid] = set()
                     self.op_to_machine_ids[opid].add(machine.idx)
+        self.opcodes = frozenset(self.op_to_machine_ids)
 
     def machines_that_can_do(self, op: Operation):
         return [mach.idx for mach in self.machines
@@ -96,11 +134,7 @@ class SDLLab:
         return self.durations[opcode]
 
     def can_perform(self, job: Job) -> bool:
-        for op in job:
-            valid_machines = self.machines_that_can_do(op)
-            if len(valid_machines) == 0:
-                return False
-        return True
+        return all(op.opcode in self.opcodes for op in job)
 
     @staticmethod
     def machine_can_do_operation(self, m: Machine, o: Operation) -> bool:
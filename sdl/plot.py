@@ -1,5 +1,6 @@
 import matplotlib.pyplot as plt
 import matplotlib
+from sdl.algorithm.scheduling.io import ColumnarSchedule
 from sdl.lab import Decision, Job, Machine, Operation
 import numpy as np
 
@@ -77,7 +78,37 @@ class SDLPlot:
         ax.set_ylabel('Job ID')
         ax.set_title('Jobs')
 
+    def plotColumnarSchedule(self, ax, schedule):
+        # One bar collection per machine, drawn straight from the machine's slice of the rows.
+        jobs = {job.idx: job for job in self.jobs}
+        for machine_id in schedule.machine_ids.tolist():
+            rows = schedule.machine(machine_id)
+            ax.broken_barh(
+                list(zip(rows['start'].tolist(), (rows['end'] - rows['start']).tolist())),
+                (machine_id - 1 - 0.5, 1.0),
+                alpha=0.25,
+                edgecolors='black',
+                facecolors=[self.colors[job_id] for job_id in rows['job'].tolist()]
+            )
+            for job_id, step, start, end in zip(*(rows[name].tolist() for name in ('job', 'step', 'start', 'end'))):
+                ax.text((start + end) / 2, machine_id - 1, f'{job_id}: {jobs[job_id].ops[step].name}',
+                        fontsize=10, ha='center', va='center')
+
     def plotSchedule(self, ax, schedule):
+        if isinstance(schedule, ColumnarSchedule):
+            self.plotColumnarSchedule(ax, schedule)
+        else:
+            self.plotDecisions(ax, schedule)
+        ax.set_ylim(-0.5, len(self.machines) - 0.5)
+        ax.set_xlim(0, self.length)
+        ax.set_xlabel('Time')
+        ax.set_ylabel('Machine')
+        ax.set_title('Schedule')
+        ax.set_yticks([m - 0.5 for m in range(len(self.machines) + 1)], minor=True)
+        ax.set_yticks([m for m in range(len(self.machines))], minor=False)
+        ax.grid(which='minor', linestyle='--')
+
+    def plotDecisions(self, ax, schedule):
         for i, decision in enumerate(schedule):
             ax.broken_barh(
                 [(decision.starting_time, decision.duration)],
@@ -94,14 +125,6 @@ class SDLPlot:
                 ha='center',
                 va='center'
             )
-        ax.set_ylim(-0.5, len(self.machines) - 0.5)
-        ax.set_xlim(0, self.length)
-        ax.set_xlabel('Time')
-        ax.set_ylabel('Machine')
-        ax.set_title('Schedule')
-        ax.set_yticks([m - 0.5 for m in range(len(self.machines) + 1)], minor=True)
-        ax.set_yticks([m for m in range(len(self.machines))], minor=False)
-        ax.grid(which='minor', linestyle='--')
 
 def renderSchedule(ms):
     schedule = []
@@ -0,0 +1,121 @@
+import numpy as np
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import cached_property
+from numpy.random import RandomState
+from sdl.algorithm.scheduling.dispatch import CompiledInstance
+from sdl.lab import Job, Machine, Operation, SDLLab, intern_operation
+from typing import List, Optional
+
+
+class LazyJobs(Sequence):
+    """Jobs of a `BulkInstance`, each created on first access and kept afterwards."""
+
+    def __init__(self, offsets: np.ndarray, opcodes: np.ndarray, operations: List[Operation]):
+        self.offsets = offsets
+        self.opcodes = opcodes
+        self.operations = operations
+        self._jobs: List[Optional[Job]] = [None] * (len(offsets) - 1)
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __getitem__(self, j):
+        if isinstance(j, slice):
+            return [self[k] for k in range(*j.indices(len(self)))]
+        job = self._jobs[j]
+        if job is None:
+            j = range(len(self))[j]
+            ops = [self.operations[c - 1] for c in self.opcodes[self.offsets[j]:self.offsets[j + 1]].tolist()]
+            job = self._jobs[j] = Job(j + 1, f'J_{j + 1}', ops)
+        return job
+
+    @property
+    def n_built(self) -> int:
+        return sum(job is not None for job in self._jobs)
+
+
+@dataclass(frozen=True)
+class BulkInstance:
+    """
+    Random instance in array form. Opcodes run from 1 to `len(durations)` and `durations[c - 1]`
+    is the duration of opcode `c`; machine `k + 1` can run opcode `c` if `capable[k, c - 1]`; the
+    operations of job `j + 1` are `opcodes[offsets[j]:offsets[j + 1]]`. `compile` goes straight to
+    the dispatching rules' `CompiledInstance`; the lab and `Job` objects are only built on request.
+    """
+    capable: np.ndarray
+    durations: np.ndarray
+    offsets: np.ndarray
+    opcodes: np.ndarray
+
+    @property
+    def n_jobs(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def n_ops(self) -> int:
+        return len(self.opcodes)
+
+    @cached_property
+    def operations(self) -> List[Operation]:
+        return [intern_operation(c + 1, f'OP_{c + 1}', duration) for c, duration in enumerate(self.durations.tolist())]
+
+    @cached_property
+    def machines(self) -> List[Machine]:
+        return [Machine(k + 1, f'M_{k + 1}', {self.operations[c] for c in np.flatnonzero(row).tolist()})
+                for k, row in enumerate(self.capable)]
+
+    @cached_property
+    def lab(self) -> SDLLab:
+        return SDLLab(self.machines, set(self.operations), {op.opcode: op.duration for op in self.operations})
+
+    @cached_property
+    def jobs(self) -> LazyJobs:
+        return LazyJobs(self.offsets, self.opcodes, self.operations)
+
+    def compile(self) -> CompiledInstance:
+        # Position 0 is unused so that the machines of opcode `c` are `eligible[c]`.
+        eligible = [()] + [tuple(np.flatnonzero(column).tolist()) for column in self.capable.T]
+        return CompiledInstance.from_arrays(
+            self.jobs, machine_ids=np.arange(1, len(self.capable) + 1), job_ids=np.arange(1, self.n_jobs + 1),
+            offsets=self.offsets, opcodes=self.opcodes, durations=self.durations[self.opcodes - 1],
+            eligible=eligible, flexibility=self.capable.sum(axis=1))
+
+
+def bulk_sdl(p: int, m: int, n: int, o: int, steps_min: int, steps_max: int,
+             random_state: Optional[RandomState] = None) -> BulkInstance:
+    """
+    Vectorized counterpart of `create_sdl` with the same parameters: `o` operations with durations
+    in [5, 50), `m` machines of which the first `p` split the operations between them and the rest
+    can each run a random subset of 1 to `max(o // 2 - 1, 1)` operations, and `n` jobs with `steps_min` to
+    `steps_max - 1` random operations. Every quantity is drawn in one call with a fixed integer
+    dtype, so the instance is identical on every platform for a given `random_state` seed.
+    """
+    if random_state is None:
+        random_state = RandomState()
+    if p > m:
+        raise ValueError('Total number of machines should be larger than partition number')
+    if p > o:
+        raise ValueError('Number of partition should be smaller than total number of operation_pool')
+    if p < 1:
+        raise ValueError('Number of partition should be at least 1')
+    if not 1 <= steps_min < steps_max:
+        raise ValueError('Minimum number of steps should be at least 1 and smaller than maximum number of steps')
+
+    durations = random_state.randint(5, 50, size=o, dtype=np.int64)
+    capable = np.zeros((m, o), dtype=bool)
+    # Same split as `np.array_split`: the first `o % p` partition machines get one extra operation.
+    capable[np.repeat(np.arange(p), [o // p + (k < o % p) for k in range(p)]), np.arange(o)] = True
+    if m > p:
+        # A uniform subset of `sizes[k]` operations per machine: the first entries of a random order.
+        # With fewer than 4 operations every extra machine gets a single one.
+        sizes = random_state.randint(1, max(o // 2, 2), size=m - p, dtype=np.int64)
+        order = np.argsort(random_state.random_sample((m - p, o)), axis=1)
+        chosen = np.arange(o) < sizes[:, None]
+        capable[p + np.nonzero(chosen)[0], order[chosen]] = True
+
+    lengths = random_state.randint(steps_min, steps_max, size=n, dtype=np.int64)
+    offsets = np.r_[0, np.cumsum(lengths)]
+    opcodes = random_state.randint(1, o + 1, size=offsets[-1], dtype=np.int64)
+    return BulkInstance(capable, durations, offsets, opcodes)
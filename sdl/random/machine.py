@@ -1,70 +1,121 @@
-import networkx as nx
 import numpy as np
 
+from dataclasses import dataclass
 from numpy.random import RandomState
-from sdl.lab import Operation, Machine
+from sdl.lab import Operation, Machine, intern_operation
 from typing import List, Set, Optional, Union
 
+try:
+    import networkx as nx
+except ImportError:
+    nx = None
+
+
+@dataclass(frozen=True)
+class Eligibility:
+    """Sparse machine-operation matrix in CSR form: machine `k` can run the operations at
+    positions `indices[indptr[k]:indptr[k + 1]]`, in increasing order."""
+    indptr: np.ndarray
+    indices: np.ndarray
+    num_operations: int
+
+    @property
+    def num_machines(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def row(self, machine: int) -> np.ndarray:
+        return self.indices[self.indptr[machine]:self.indptr[machine + 1]]
+
+    def to_dense(self) -> np.ndarray:
+        dense = np.zeros((self.num_machines, self.num_operations), dtype=bool)
+        dense[np.repeat(np.arange(self.num_machines), np.diff(self.indptr)), self.indices] = True
+        return dense
+
+
+def _sample_without_replacement(n: int, k: int, random_state: RandomState) -> np.ndarray:
+    """`k` distinct integers from `range(n)` in increasing order, without materializing `range(n)`
+    unless `k` is a large fraction of it."""
+    if 4 * k >= n:
+        return np.sort(random_state.permutation(n)[:k])
+    sample = np.empty(0, dtype=np.int64)
+    while len(sample) < k:
+        draws = random_state.randint(0, n, size=int(1.1 * (k - len(sample))) + 16, dtype=np.int64)
+        sample = np.union1d(sample, draws)
+    if len(sample) > k:
+        # A uniform subset of a uniform sample is still uniform.
+        sample = np.sort(sample[random_state.permutation(len(sample))[:k]])
+    return sample
+
+
+def sparse_machine_operation_matching(
+        num_machines: int,
+        num_operations: int,
+        avg_degree: float,
+        random_state: RandomState = None
+) -> Eligibility:
+    """
+    Random bipartite machine-operation matrix with about `avg_degree * (num_machines +
+    num_operations)` edges. Every machine and operation first gets one edge, dealt round-robin
+    along the larger side; the remaining edges are sampled without replacement from the flat
+    index space `machine * num_operations + operation` of the pairs not covered yet.
+    """
+    if random_state is None:
+        random_state = RandomState()
+    if avg_degree < 1:
+        raise ValueError("`avg_degree` must be at least 1.")
+
+    n = max(num_machines, num_operations)
+    cover = np.arange(n, dtype=np.int64) % num_machines * num_operations + np.arange(n) % num_operations
+    cover = np.unique(cover)
+    possible = num_machines * num_operations
+    needed = min(int(avg_degree * (num_machines + num_operations)), possible) - len(cover)
+    extra = _sample_without_replacement(possible - len(cover), max(needed, 0), random_state)
+    # Map ranks among the uncovered pairs back to flat indices by skipping the covered ones.
+    extra += np.searchsorted(cover - np.arange(len(cover)), extra, side='right')
+
+    edges = np.union1d(cover, extra)
+    machines, operations = np.divmod(edges, num_operations)
+    indptr = np.r_[0, np.cumsum(np.bincount(machines, minlength=num_machines))]
+    return Eligibility(indptr, operations, num_operations)
+
 
 def bipartite_machine_operation_matching(
         num_machines: int,
         num_operations: int,
         avg_degree: float,
         random_state: RandomState = None,
-        return_graph: bool = False
-) -> Union[list[Machine], nx.Graph]:
+        return_graph: bool = False,
+        operations: Optional[List[Operation]] = None
+) -> Union[list[Machine], 'nx.Graph']:
+    """
+    Machines for a random `sparse_machine_operation_matching`. Operation `k` is `operations[k]`;
+    by default the operations are created with opcodes from 1, named `o-<opcode>` like the other
+    generators, and durations in [5, 50). With `return_graph=True` the matching is returned as a
+    networkx graph with machine nodes `m-<k>` and operation nodes `o-<k>` for positions `k` instead.
+    """
     if random_state is None:
         random_state = RandomState()
-
-    if avg_degree < 1:
-        raise ValueError("`avg_degree` must be at least 1.")
-    machine_nodes = [f"m-{mach}" for mach in range(num_machines)]
-    operation_nodes = [f"o-{op}" for op in range(num_operations)]
-    g = nx.Graph()
-    g.add_nodes_from(machine_nodes, bipartite=0)
-    g.add_nodes_from(operation_nodes, bipartite=1)
-
-    # Initialize the first batch of edges, ensuring that all machines and operations
-    # are covered by at least 1 pair. The split in logic is to handle cases where there
-    # are fewer machines OR fewer operations to have a clean 1:1 matching.
-    if num_machines < num_operations:
-        mdx = 0
-        for op_node in operation_nodes:
-            m_node = machine_nodes[mdx % len(machine_nodes)]
-            g.add_edge(m_node, op_node)
-            mdx += 1
-    else:
-        odx = 0
-        for m_node in machine_nodes:
-            op_node = operation_nodes[odx % len(operation_nodes)]
-            g.add_edge(m_node, op_node)
-            odx += 1
-
-    # Add new random edges between machines and operations if the average degree
-    # threshold is not met. However, please keep in mind that this will be limited
-    # based on the number of possible machine-operation matches.
-    needed_edges = avg_degree * g.number_of_nodes()
-    edges_to_add = needed_edges - g.number_of_edges()
-    possible_edges = num_operations * num_machines
-    for e in range(edges_to_add):
-        if e + g.number_of_edges() >= possible_edges:
-            break
-        done = False
-        while not done:
-            m_node = random_state.choice(machine_nodes)
-            op_node = random_state.choice(operation_nodes)
-            if not g.has_edge(m_node, op_node):
-                g.add_edge(m_node, op_node)
-                done = True
+    eligibility = sparse_machine_operation_matching(num_machines, num_operations, avg_degree, random_state)
 
     if return_graph:
+        if nx is None:
+            raise ImportError("`return_graph=True` requires networkx.")
+        g = nx.Graph()
+        g.add_nodes_from((f"m-{mach}" for mach in range(num_machines)), bipartite=0)
+        g.add_nodes_from((f"o-{op}" for op in range(num_operations)), bipartite=1)
+        machine_of = np.repeat(np.arange(num_machines), np.diff(eligibility.indptr))
+        g.add_edges_from((f"m-{m}", f"o-{o}") for m, o in zip(machine_of.tolist(), eligibility.indices.tolist()))
         return g
 
-    machines = []
-    for m_idx, m_node in enumerate(machine_nodes):
-        operations = set([op_node for op_node in g.neighbors(m_node)])  # FIXME: Convert to Operation objects.
-        machines.append(Machine(m_idx, m_node, operations))
-    return machines
+    if operations is None:
+        durations = random_state.randint(5, 50, size=num_operations, dtype=np.int64).tolist()
+        operations = [intern_operation(k + 1, f"o-{k + 1}", duration) for k, duration in enumerate(durations)]
+    return [Machine(m_idx, f"m-{m_idx}", {operations[k] for k in eligibility.row(m_idx).tolist()})
+            for m_idx in range(num_machines)]
 
 
 def create_machine_partition(
@@ -99,6 +150,8 @@ def create_machine_partition(
 
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     # a = [1, 2, 1, 3, 3, 3]
     # b = [2, 2, 2, 1, 4, 2]
     # g = nx.algorithms.bipartite.configuration_model(a, b)
@@ -108,7 +161,7 @@ if __name__ == "__main__":
         return g.number_of_edges() / g.number_of_nodes()
 
 
-    g = bipartite_machine_operation_matching(5, 4, 1)
+    g = bipartite_machine_operation_matching(5, 4, 1, return_graph=True)
     print(f"Avg. Degree: {avg_degree(g)}")
     top = {node for (node, data) in g.nodes(data=True) if data["bipartite"] == 0}
     pos = nx.bipartite_layout(g, top)
@@ -1,11 +1,11 @@
 import numpy as np
 
-from sdl.lab import Operation
+from sdl.lab import Operation, intern_operation
 from typing import List, Set, Optional
 
 
 def create_operation(operation_id: int, operation_name: str, duration: int) -> Operation:
-    return Operation(operation_id, operation_name, duration)
+    return intern_operation(operation_id, operation_name, duration)
 
 
 def create_operation_set(filename: str = None,
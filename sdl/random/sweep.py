@@ -0,0 +1,69 @@
+import numpy as np
+
+from dataclasses import dataclass
+from numpy.random import RandomState
+from sdl.random.sdl import create_sdl
+from typing import Any, Callable, Dict, Iterator, Sequence, Tuple, Union
+
+# Axis name, or several names whose values are drawn together from one axis of tuples.
+AxisKey = Union[str, Tuple[str, ...]]
+
+
+@dataclass(frozen=True)
+class Sweep:
+    """
+    Parameter grid over `generate(**params, random_state=...)`, e.g. `create_sdl` or `bulk_sdl`.
+    Points are numbered in row-major order of the axes of `grid`. The random state of a point
+    is seeded with `SeedSequence(seed, spawn_key=coords)` for its grid coordinates, so every
+    instance depends only on the seed and its own coordinates: the sweep can be split into shards,
+    run in parallel or resumed at any index with identical instances.
+    """
+    grid: Dict[AxisKey, Sequence[Any]]
+    seed: int
+    generate: Callable = create_sdl
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(len(values) for values in self.grid.values())
+
+    def __len__(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    def coords(self, index: int) -> Tuple[int, ...]:
+        if not 0 <= index < len(self):
+            raise IndexError(f"Sweep index {index} out of range for {len(self)} points.")
+        return tuple(int(k) for k in np.unravel_index(index, self.shape))
+
+    def params(self, coords: Tuple[int, ...]) -> Dict[str, Any]:
+        params = {}
+        for (key, values), k in zip(self.grid.items(), coords):
+            if isinstance(key, tuple):
+                params.update(zip(key, values[k]))
+            else:
+                params[key] = values[k]
+        return params
+
+    def random_state(self, coords: Tuple[int, ...], stream: int = 0) -> RandomState:
+        """Random state of stream `stream` at a grid point. Stream 0 generates the instance; further
+        streams, e.g. for a randomized solver, are independent of it."""
+        sequence = np.random.SeedSequence(self.seed, spawn_key=tuple(coords) + (stream,))
+        return RandomState(np.random.MT19937(sequence))
+
+    def instance(self, index: int) -> Any:
+        coords = self.coords(index)
+        return self.generate(**self.params(coords), random_state=self.random_state(coords))
+
+    def iter(self, shard: int = 0, n_shards: int = 1, start: int = 0) -> Iterator[Tuple[Dict[str, Any], int, Any]]:
+        """Lazily yields `(params, index, instance)` for the points `index >= start` with
+        `index % n_shards == shard`. Shards interleave so that they get similar instance sizes."""
+        if not 0 <= shard < n_shards:
+            raise ValueError(f"Shard {shard} out of range for {n_shards} shards.")
+        first = start + (shard - start) % n_shards
+        for index in range(first, len(self), n_shards):
+            coords = self.coords(index)
+            params = self.params(coords)
+            yield params, index, self.generate(**params, random_state=self.random_state(coords))
+
+    def __iter__(self) -> Iterator[Tuple[Dict[str, Any], int, Any]]:
+        return self.iter()
+
@@ -0,0 +1,139 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+from typing import Any, Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Typed columns of one run. Extra keys passed to `ResultsStore.append` are ignored.
+RESULT_COLUMNS: Dict[str, type] = {
+    'index': int,
+    'partitions': int,
+    'n_machines': int,
+    'n_jobs': int,
+    'n_operations': int,
+    'steps_min': int,
+    'steps_max': int,
+    'algorithm': str,
+    'makespan': int,
+    'runtime': float,
+}
+_SQL_TYPES = {int: 'INTEGER', float: 'REAL', str: 'TEXT'}
+
+
+def _convert(kind: type, value: Any) -> Any:
+    # Makespans from the ILP solver are floats such as 16.999999; round them instead of truncating.
+    return int(round(value)) if kind is int else kind(value)
+
+
+class ResultsStore:
+    """
+    Append-only table of run results. Rows are buffered in memory and written `batch_size` at a
+    time, either as one Parquet part file per batch in the directory `path` (when pyarrow is
+    installed and `backend` is 'parquet') or in a single transaction to the SQLite file `path`.
+    `read` returns a DataFrame and pushes equality filters down to the backend.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1_000, backend: Optional[str] = None):
+        if backend is None:
+            backend = 'parquet' if pa is not None and not path.endswith(('.db', '.sqlite', ':memory:')) else 'sqlite'
+        if backend == 'parquet' and pa is None:
+            raise ImportError("The parquet backend requires pyarrow.")
+        if backend not in ('parquet', 'sqlite'):
+            raise ValueError(f"Unknown results backend {backend}.")
+        self.path = path
+        self.batch_size = batch_size
+        self.backend = backend
+        self.buffer: List[tuple] = []
+        # Rows may be appended from a background `AsyncStorageWriter` while the main thread reads.
+        self._lock = threading.RLock()
+        self._connection = None
+        if backend == 'parquet':
+            os.makedirs(path, exist_ok=True)
+            self._schema = pa.schema([(name, {int: pa.int64(), float: pa.float64(), str: pa.string()}[kind])
+                                      for name, kind in RESULT_COLUMNS.items()])
+        else:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            columns = ', '.join(f'"{name}" {_SQL_TYPES[kind]}' for name, kind in RESULT_COLUMNS.items())
+            self._connection.execute(f'CREATE TABLE IF NOT EXISTS results ({columns})')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS results_algorithm ON results (algorithm)')
+            self._connection.commit()
+
+    def append(self, row: Dict[str, Any]):
+        with self._lock:
+            self.buffer.append(tuple(_convert(kind, row[name]) if row.get(name) is not None else None
+                                     for name, kind in RESULT_COLUMNS.items()))
+            if len(self.buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self.buffer:
+            return
+        if self.backend == 'parquet':
+            columns = list(zip(*self.buffer))
+            table = pa.Table.from_arrays([pa.array(column, type=field.type)
+                                          for column, field in zip(columns, self._schema)], schema=self._schema)
+            # Part names sort in write order, and the random suffix and exclusive create keep
+            # concurrent writers from overwriting each other's parts.
+            name = f'part-{time.time_ns():020d}-{uuid.uuid4().hex}.parquet'
+            with open(os.path.join(self.path, name), 'xb') as f:
+                pq.write_table(table, f)
+        else:
+            placeholders = ', '.join('?' for _ in RESULT_COLUMNS)
+            with self._connection:
+                self._connection.executemany(f'INSERT INTO results VALUES ({placeholders})', self.buffer)
+        self.buffer = []
+
+    def read(self, columns: Optional[List[str]] = None, **filters) -> pd.DataFrame:
+        """Rows whose columns equal the given `filters`, e.g. `read(algorithm='greedy_main')`, in
+        insertion order. Buffered rows are flushed first."""
+        with self._lock:
+            return self._read(columns, **filters)
+
+    def _read(self, columns: Optional[List[str]] = None, **filters) -> pd.DataFrame:
+        self._flush()
+        columns = list(RESULT_COLUMNS) if columns is None else columns
+        for name in list(columns) + list(filters):
+            if name not in RESULT_COLUMNS:
+                raise KeyError(f"Unknown results column {name}.")
+        if self.backend == 'parquet':
+            if not any(name.endswith('.parquet') for name in os.listdir(self.path)):
+                return pd.DataFrame({name: pd.Series(dtype=object) for name in columns})
+            expression = None
+            for name, value in filters.items():
+                condition = ds.field(name) == value
+                expression = condition if expression is None else expression & condition
+            dataset = ds.dataset(self.path, schema=self._schema, format='parquet')
+            return dataset.to_table(columns=columns, filter=expression).to_pandas()
+        where = ' AND '.join(f'"{name}" = ?' for name in filters)
+        names = ', '.join(f'"{name}"' for name in columns)
+        query = f'SELECT {names} FROM results'
+        if where:
+            query += f' WHERE {where}'
+        return pd.read_sql_query(query + ' ORDER BY rowid', self._connection, params=list(filters.values()))
+
+    def close(self):
+        self.flush()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
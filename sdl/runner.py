@@ -0,0 +1,248 @@
+import multiprocessing
+import os
+import queue
+import threading
+import traceback
+
+from collections import deque
+from dataclasses import dataclass, field
+from sdl.instances import InstanceStore
+from sdl.random.sweep import Sweep
+from sdl.results import ResultsStore
+from sdl.storage import AsyncStorageWriter, Storage
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+# An experiment function as in `test.py`: `fn(machines, operations, durations, jobs, random_state,
+# storage)`, which solves the instance and calls `storage.save()`.
+Experiment = Callable[..., None]
+
+
+def task_key(fn: Experiment, index: int) -> str:
+    return f'{fn.__name__}:{index}'
+
+
+class Checkpoint:
+    """
+    Append-only log of finished tasks, one `key<TAB>status` line each. A line is only trusted once
+    its newline is on disk, so a run killed halfway through writing one never marks that task done;
+    such a torn last line is cut off when the log is reopened.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.status: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, 'rb+') as f:
+                data = f.read()
+                f.truncate(data.rfind(b'\n') + 1)
+            for line in data.decode().splitlines(keepends=True):
+                if line.endswith('\n') and '\t' in line:
+                    key, status = line.rstrip('\n').split('\t', 1)
+                    self.status[key] = status
+        self._file = open(path, 'a')
+
+    def done(self, retry_failed: bool = False) -> Set[str]:
+        return {key for key, status in self.status.items() if status == 'ok' or not retry_failed}
+
+    def add(self, keys: Iterable[str], status: str = 'ok'):
+        keys = list(keys)
+        if not keys:
+            return
+        self._file.write(''.join(f'{key}\t{status}\n' for key in keys))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.status.update((key, status) for key in keys)
+
+    def close(self):
+        self._file.close()
+
+
+@dataclass
+class SweepReport:
+    completed: int = 0
+    skipped: int = 0
+    timed_out: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+class _QueueWriter:
+    """Stands in for the storage writer inside a task process and sends the storage back to the
+    runner, which owns the only real writer."""
+
+    def __init__(self, key: str, results: multiprocessing.Queue):
+        self.key = key
+        self.results = results
+        self.sent = False
+
+    def submit(self, storage: Storage):
+        storage.writer = None
+        storage.instances = None
+        self.results.put((self.key, 'ok', storage))
+        self.sent = True
+
+
+def _run_task(sweep: Sweep, fn: Experiment, index: int, filename: str, csv_file: str, save_pkl: bool,
+              instances_root: Optional[str], results: multiprocessing.Queue):
+    key = task_key(fn, index)
+    try:
+        coords = sweep.coords(index)
+        params = sweep.params(coords)
+        machines, jobs, operations, _ = sweep.instance(index)
+        durations = {op.opcode: op.duration for op in operations}
+        writer = _QueueWriter(key, results)
+        # Instances are content-addressed and written atomically, so every task process can put
+        # its instance into the shared store itself before `fn` calls `set_data`.
+        instances = InstanceStore(instances_root) if instances_root is not None else None
+        storage = Storage(filename=filename.format(index=index, algorithm=fn.__name__), csv_file=csv_file,
+                          save_pkl=save_pkl, instances=instances, writer=writer)
+        storage.set_meta_data(params['p'], params['m'], params['n'], params['o'], params['steps_min'],
+                              params['steps_max'], index, algorithm_name=fn.__name__)
+        fn(machines, operations, durations, jobs, sweep.random_state(coords, stream=1), storage)
+        if not writer.sent:
+            results.put((key, 'ok', None))
+    except Exception:
+        results.put((key, 'error', traceback.format_exc()))
+
+
+class _TaskWrite:
+    """Writes one finished task on the writer thread and checkpoints it once its results row is
+    durable, i.e. right away for CSV output and after the next batch flush of a `ResultsStore`."""
+
+    def __init__(self, runner: 'SweepRunner', key: str, storage: Optional[Storage]):
+        self.runner = runner
+        self.key = key
+        self.storage = storage
+
+    def write(self):
+        if self.storage is not None:
+            self.storage.write()
+        with self.runner._lock:
+            self.runner._unflushed.append(self.key)
+            if self.runner.results is None or not self.runner.results.buffer:
+                self.runner.checkpoint.add(self.runner._unflushed)
+                self.runner._unflushed = []
+
+
+class SweepRunner:
+    """
+    Runs every (instance, experiment) task of a `Sweep` in a pool of `n_workers` processes, one
+    process per task so that a task exceeding `timeout` seconds can be terminated. Finished storages
+    are sent back to this process and written by one `AsyncStorageWriter`, so result rows and files
+    have a single writer. Tasks recorded in the checkpoint file are skipped, which makes an
+    interrupted sweep resumable; timed-out and failed tasks are recorded too and retried only with
+    `retry_failed=True`.
+    """
+
+    def __init__(self, sweep: Sweep, experiments: List[Experiment], checkpoint: str, filename: str = '',
+                 csv_file: str = '', save_pkl: bool = False, results: Optional[ResultsStore] = None,
+                 instances: Optional[InstanceStore] = None, n_workers: int = 1, timeout: Optional[float] = None,
+                 retry_failed: bool = False):
+        self.sweep = sweep
+        self.experiments = experiments
+        self.checkpoint = Checkpoint(checkpoint)
+        self.filename = filename
+        self.csv_file = csv_file
+        self.save_pkl = save_pkl
+        self.results = results
+        self.instances = instances
+        self.n_workers = n_workers
+        self.timeout = timeout
+        self.retry_failed = retry_failed
+        self._unflushed: List[str] = []
+        # The checkpoint is written both by the writer thread and by `run`.
+        self._lock = threading.Lock()
+
+    def tasks(self, shard: int = 0, n_shards: int = 1) -> List[tuple]:
+        """The `(experiment, index)` tasks of a shard that are not in the checkpoint yet."""
+        done = self.checkpoint.done(self.retry_failed)
+        return [(fn, index) for index in range(shard, len(self.sweep), n_shards) for fn in self.experiments
+                if task_key(fn, index) not in done]
+
+    def run(self, shard: int = 0, n_shards: int = 1, writer: Optional[AsyncStorageWriter] = None) -> SweepReport:
+        start = perf_counter()
+        tasks = deque(self.tasks(shard, n_shards))
+        total = len(range(shard, len(self.sweep), n_shards)) * len(self.experiments)
+        report = SweepReport(skipped=total - len(tasks))
+        own_writer = writer is None
+        writer = AsyncStorageWriter() if own_writer else writer
+        ctx = multiprocessing.get_context()
+        messages = ctx.Queue()
+        running: Dict[str, tuple] = {}  # key -> (process, deadline)
+        try:
+            while tasks or running:
+                while tasks and len(running) < self.n_workers:
+                    fn, index = tasks.popleft()
+                    process = ctx.Process(target=_run_task, daemon=True, args=(
+                        self.sweep, fn, index, self.filename, self.csv_file, self.save_pkl,
+                        self.instances.root if self.instances is not None else None, messages))
+                    process.start()
+                    deadline = perf_counter() + self.timeout if self.timeout is not None else float('inf')
+                    running[task_key(fn, index)] = (process, deadline)
+
+                wait = min(deadline for _, deadline in running.values()) - perf_counter()
+                try:
+                    key, status, payload = messages.get(timeout=min(max(wait, 0.0), 0.5))
+                except queue.Empty:
+                    pass
+                else:
+                    # Tasks that already timed out or died may still have reported back; ignore them.
+                    if key in running:
+                        running.pop(key)[0].join()
+                        if status == 'ok':
+                            self._finish(writer, key, payload)
+                            report.completed += 1
+                        else:
+                            report.failed[key] = payload
+                            with self._lock:
+                                self.checkpoint.add([key], 'error')
+
+                now = perf_counter()
+                for key, (process, deadline) in list(running.items()):
+                    if now >= deadline:
+                        process.terminate()
+                        process.join()
+                        del running[key]
+                        report.timed_out.append(key)
+                        with self._lock:
+                            self.checkpoint.add([key], 'timeout')
+                    elif not process.is_alive() and process.exitcode != 0:
+                        # The process died without reporting back, e.g. it was killed for memory.
+                        del running[key]
+                        report.failed[key] = f'Task process exited with code {process.exitcode}.'
+                        with self._lock:
+                            self.checkpoint.add([key], 'error')
+        finally:
+            for process, _ in running.values():
+                process.terminate()
+                process.join()
+            try:
+                writer.flush()
+            finally:
+                try:
+                    if self.results is not None:
+                        self.results.flush()
+                    with self._lock:
+                        self.checkpoint.add(self._unflushed)
+                        self._unflushed = []
+                finally:
+                    if own_writer:
+                        writer.close()
+        report.elapsed = perf_counter() - start
+        return report
+
+    def _finish(self, writer: AsyncStorageWriter, key: str, storage: Optional[Storage]):
+        if storage is not None:
+            storage.results = self.results
+            storage.instances = self.instances
+        writer.submit(_TaskWrite(self, key, storage))
+
+    def close(self):
+        self.checkpoint.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
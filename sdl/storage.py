@@ -1,29 +1,57 @@
+import numpy as np
 import os.path
 import pickle
+import queue
+import threading
+from sdl.algorithm.scheduling.io import ColumnarSchedule, ScheduleResult
+from sdl.archive import ARCHIVE_SUFFIX, ScheduleArchive, write_archive
+from sdl.instances import InstanceStore
 from sdl.lab import SDLLab, Job, Decision
-from typing import List
+from sdl.results import ResultsStore
+from sdl.verify import schedule_columns
+from time import perf_counter
+from typing import List, Optional, Union
 import pandas as pd
 
 
 class Storage:
-    def __init__(self, filename: str = '', csv_file: str = '', save_pkl: bool = True):
+    def __init__(self, filename: str = '', csv_file: str = '', save_pkl: bool = True,
+                 results: Optional[ResultsStore] = None, instances: Optional[InstanceStore] = None,
+                 writer: Optional['AsyncStorageWriter'] = None):
         self.pd_data_frame = None
         self.filename = filename
         self.csv_file = csv_file
         self.data = None
         self.meta_data = None
         self.save_pkl = save_pkl
+        # When a results store is given, metadata rows go there in batches instead of the CSV file.
+        self.results = results
+        # When an instance store is given, runs only keep the content hash of their lab and jobs.
+        self.instances = instances
+        # Filenames ending in `ARCHIVE_SUFFIX` are saved as memory-mapped archives, see `sdl.archive`.
+        self.archive = None
+        # When a writer is given, `save` hands the storage to its background thread and returns.
+        self.writer = writer
 
-    def set_data(self, lab: SDLLab, jobs: List[Job], schedule: List[Decision], makespan: int, runtime: float):
-        self.data = {
-            'machines': lab.machines,
-            'operation_pool': lab.operations,
-            'durations': lab.durations,
-            'jobs': jobs,
+    def set_data(self, lab: SDLLab, jobs: List[Job], schedule: Union[List[Decision], ScheduleResult, ColumnarSchedule],
+                 makespan: int, runtime: float):
+        # Schedule results are stored as columns, which pickle to a fraction of the object-based size.
+        if isinstance(schedule, ScheduleResult):
+            schedule = ColumnarSchedule.from_result(schedule)
+        if self.instances is not None:
+            self.data = {'instance': self.instances.put(lab, jobs)}
+        else:
+            self.data = {
+                'machines': lab.machines,
+                'operation_pool': lab.operations,
+                'durations': lab.durations,
+                'jobs': jobs,
+            }
+        self.data.update({
             'schedule': schedule,
             'makespan': makespan,
             'runtime': runtime,
-        }
+        })
 
     def set_meta_data(self, p: int, m: int, n: int, o: int, steps_min: int, steps_max: int, index: int,
                       algorithm_name: str = 'unspecified'):
@@ -42,13 +70,24 @@ class Storage:
         self.data['makespan_history'] = history
 
     def save(self):
-        if self.save_pkl:
+        if self.writer is not None:
+            self.writer.submit(self)
+        else:
+            self.write()
+
+    def write(self):
+        if self.save_pkl and not self.filename.endswith(ARCHIVE_SUFFIX):
             with open(self.filename, 'wb') as f:
                 pickle.dump(self.data, f)
 
         self.meta_data['makespan'] = [self.data['makespan']]
         self.meta_data['runtime'] = [self.data['runtime']]
         self.data['meta_data'] = self.meta_data
+        if self.save_pkl and self.filename.endswith(ARCHIVE_SUFFIX):
+            self.save_archive()
+        if self.results is not None:
+            self.results.append({name: values[0] for name, values in self.meta_data.items()})
+            return
         self.pd_data_frame = pd.DataFrame.from_dict(self.meta_data)
         if not os.path.exists(self.csv_file):
             self.pd_data_frame.to_csv(self.csv_file, header=True, index=False)
@@ -56,7 +95,140 @@ class Storage:
             with open(self.csv_file, 'a') as f:
                 self.pd_data_frame.to_csv(f, header=False, index=False)
 
-    def load(self) -> dict:
+    def save_archive(self):
+        meta = {'makespan': int(self.data['makespan']), 'runtime': float(self.data['runtime']),
+                'meta_data': {name: values[0] for name, values in self.meta_data.items()}}
+        arrays = {}
+        if 'instance' in self.data:
+            meta['instance'] = self.data['instance']
+        else:
+            instance = {name: self.data[name] for name in ('machines', 'operation_pool', 'durations', 'jobs')}
+            arrays['instance'] = np.frombuffer(pickle.dumps(instance), dtype=np.uint8)
+        if 'makespan_history' in self.data:
+            arrays['makespan_history'] = np.asarray(self.data['makespan_history'], dtype=np.int64)
+        schedule = self.data['schedule']
+        if not isinstance(schedule, ColumnarSchedule):
+            schedule = ColumnarSchedule(self.data['makespan'], schedule_columns(schedule, self.data.get('jobs'))[0])
+        write_archive(self.filename, meta, schedule, arrays)
+
+    def load(self, fields: Optional[List[str]] = None) -> dict:
+        """Load the stored run. For archives, only the header is read up front and `fields`, if
+        given, limits the sections that are read, e.g. `load(['makespan', 'runtime'])`."""
+        if self.filename.endswith(ARCHIVE_SUFFIX):
+            return self.load_archive(fields)
         with open(self.filename, 'rb') as f:
             self.data = pickle.load(f)
+        self._resolve_instance()
         return self.data
+
+    def load_archive(self, fields: Optional[List[str]] = None) -> dict:
+        self.archive = ScheduleArchive(self.filename)
+        meta = self.archive.meta
+        self.data = {'makespan': meta['makespan'], 'runtime': meta['runtime'],
+                     'meta_data': {name: [value] for name, value in meta['meta_data'].items()}}
+
+        def wanted(*names):
+            return fields is None or any(name in fields for name in names)
+
+        if wanted('makespan_history') and 'makespan_history' in self.archive.sections:
+            self.data['makespan_history'] = self.archive.array('makespan_history').tolist()
+        if wanted('schedule'):
+            self.data['schedule'] = self.archive.schedule()
+        if wanted('machines', 'operation_pool', 'durations', 'jobs'):
+            if 'instance' in meta:
+                self.data['instance'] = meta['instance']
+                self._resolve_instance()
+            else:
+                self.data.update(pickle.loads(self.archive.array('instance').tobytes()))
+        return self.data
+
+    def _resolve_instance(self):
+        if 'instance' in self.data:
+            if self.instances is None:
+                raise ValueError(f"{self.filename} references instance {self.data['instance']}; "
+                                 f"an InstanceStore is needed to load it.")
+            lab, jobs = self.instances.get(self.data['instance'])
+            self.data.update({
+                'machines': lab.machines,
+                'operation_pool': lab.operations,
+                'durations': lab.durations,
+                'jobs': jobs,
+            })
+
+
+class AsyncStorageWriter:
+    """
+    Writes `Storage` objects from a background thread so that experiment loops do not wait for
+    pickling and disk I/O. `submit` blocks once `maxsize` storages are queued, which bounds memory
+    when the disk is slower than the solvers. A submitted storage must not be modified afterwards.
+    `close` (or leaving the `with` block) writes everything still queued and re-raises the first
+    error of the writer thread. `stats` reports the queue depth and the write latencies.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self.written = 0
+        self.max_depth = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.total_wait = 0.0
+        self.error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='storage-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, storage: Storage):
+        if self._closed:
+            raise RuntimeError("The storage writer is closed.")
+        self.queue.put((perf_counter(), storage))
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def _run(self):
+        while True:
+            submitted, storage = self.queue.get()
+            try:
+                if storage is None:
+                    return
+                start = perf_counter()
+                storage.write()
+                latency = perf_counter() - start
+                self.written += 1
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+                self.total_wait += start - submitted
+            except BaseException as e:
+                if self.error is None:
+                    self.error = e
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """Block until every submitted storage has been written."""
+        self.queue.join()
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self.queue.put((perf_counter(), None))
+            self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'queue_depth': self.queue.qsize(),
+            'max_depth': self.max_depth,
+            'written': self.written,
+            'mean_latency': self.total_latency / self.written if self.written else 0.0,
+            'max_latency': self.max_latency,
+            'mean_wait': self.total_wait / self.written if self.written else 0.0,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
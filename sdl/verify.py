@@ -1,4 +1,159 @@
-from itertools import groupby
+import numpy as np
+
+from dataclasses import dataclass
+from sdl.algorithm.scheduling.io import SCHEDULE_DTYPE, ColumnarSchedule
+from typing import Optional
+
+# Violation kinds reported by `verify_schedule`.
+JOB_STEP_KINDS = ('unknown_job', 'unknown_step', 'missing', 'duplicate', 'wrong_operation', 'precedence')
+MACHINE_KINDS = ('unknown_machine', 'incapable_machine', 'duration', 'overlap')
+
+
+@dataclass(frozen=True)
+class Violation:
+    kind: str
+    job: int
+    step: int
+    machine: int
+    message: str
+
+
+def schedule_columns(schedule, jobs) -> tuple[np.ndarray, Optional[int]]:
+    """
+    Convert a schedule into a structured array with `SCHEDULE_DTYPE` (one row per scheduled step)
+    and its reported makespan, if it has one. `schedule` is a `ScheduleResult`, whose job ids are
+    `Job.idx`, or a list of `Decision`, whose job ids are positions in `jobs` and whose steps follow
+    the order of their starting times. A `ColumnarSchedule` is used as it is. The `job` column holds
+    job ids as given.
+    """
+    if hasattr(schedule, 'machine_schedules'):
+        schedule = ColumnarSchedule.from_result(schedule)
+    if isinstance(schedule, ColumnarSchedule):
+        return schedule.rows, schedule.makespan
+
+    columns = np.empty(len(schedule), dtype=SCHEDULE_DTYPE)
+    if len(schedule):
+        columns[:] = [(d.job_id, 0, d.machine_id, d.operation.opcode, 0, 0) for d in schedule]
+        # ILP times are floats such as 4.9999999, which a cast to int64 would truncate.
+        times = np.rint(np.array([(d.starting_time, d.completion_time) for d in schedule], dtype=np.float64))
+        columns['start'], columns['end'] = times.T
+        order = np.lexsort((columns['start'], columns['job']))
+        job = columns['job'][order]
+        first = np.r_[0, np.flatnonzero(job[1:] != job[:-1]) + 1]
+        group_start = np.repeat(first, np.diff(np.r_[first, len(job)]))
+        columns['step'][order] = np.arange(len(job)) - group_start
+    return columns, None
+
+
+def _lookup(keys: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Positions of `values` in `keys` and a mask of the values that were found."""
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    pos = np.minimum(np.searchsorted(sorted_keys, values), max(len(keys) - 1, 0))
+    found = sorted_keys[pos] == values if len(keys) else np.zeros(len(values), dtype=bool)
+    return order[pos] if len(keys) else pos, found
+
+
+def verify_columns(columns: np.ndarray, lab, jobs, makespan: Optional[int] = None,
+                   job_ids: str = 'idx') -> list[Violation]:
+    """
+    Check a columnar schedule against every constraint of the scheduling problem: each job step is
+    scheduled exactly once with the job's operation, on a machine of `lab` that can run the opcode,
+    for at least the opcode's duration; the steps of a job start after the previous step ends; no
+    machine runs two steps at once; and `makespan`, if given, covers the last completion time.
+    `job_ids` says whether the `job` column holds `Job.idx` values or positions in `jobs`.
+    All checks are sort-and-diff operations over the columns.
+    """
+    violations = []
+
+    def report(kind, rows, message):
+        for r in np.flatnonzero(rows) if rows.dtype == bool else rows:
+            violations.append(Violation(kind, int(job[r]), int(step[r]), int(machine[r]), message.format(
+                job=int(job[r]), step=int(step[r]), machine=int(machine[r]), opcode=int(opcode[r]),
+                start=int(start[r]), end=int(end[r]))))
+
+    job, step, machine = columns['job'], columns['step'], columns['machine']
+    opcode, start, end = columns['opcode'], columns['start'], columns['end']
+
+    # Expected steps: one flat row per (job, step) with the opcode of the job's operation.
+    lengths = np.fromiter((len(j) for j in jobs), dtype=np.int64, count=len(jobs))
+    offsets = np.r_[0, np.cumsum(lengths)]
+    expected_opcode = np.fromiter((op.opcode for j in jobs for op in j), dtype=np.int64, count=offsets[-1])
+    if job_ids == 'idx':
+        position, known_job = _lookup(np.fromiter((j.idx for j in jobs), dtype=np.int64, count=len(jobs)), job)
+    else:
+        position, known_job = job, (job >= 0) & (job < len(jobs))
+    report('unknown_job', ~known_job, "Job {job} is not part of the instance.")
+    position = np.where(known_job, position, 0)
+    known_step = known_job & (step >= 0) & (step < lengths[position] if len(jobs) else False)
+    report('unknown_step', known_job & ~known_step, "Job {job} has no step {step}.")
+
+    flat = offsets[position] + step
+    valid = np.flatnonzero(known_step)
+    counts = np.bincount(flat[valid], minlength=offsets[-1])
+    duplicated = np.zeros(len(columns), dtype=bool)
+    duplicated[valid] = counts[flat[valid]] > 1
+    report('duplicate', duplicated, "Step {step} of job {job} is scheduled more than once.")
+    for e in np.flatnonzero(counts == 0):
+        j = int(np.searchsorted(offsets, e, side='right') - 1)
+        job_id = jobs[j].idx if job_ids == 'idx' else j
+        violations.append(Violation('missing', job_id, int(e - offsets[j]), -1,
+                                    f"Step {e - offsets[j]} of job {job_id} is not scheduled."))
+    wrong = np.zeros(len(columns), dtype=bool)
+    wrong[valid] = expected_opcode[flat[valid]] != opcode[valid]
+    report('wrong_operation', wrong, "Step {step} of job {job} runs opcode {opcode} instead of the job's operation.")
+
+    # Machines: capability and duration per row, looked up in dense (machine, opcode) tables.
+    machine_ids = np.fromiter((m.idx for m in lab.machines), dtype=np.int64, count=len(lab.machines))
+    lab_opcodes = np.array(sorted(lab.durations), dtype=np.int64)
+    machine_pos, known_machine = _lookup(machine_ids, machine)
+    report('unknown_machine', ~known_machine, "Machine {machine} is not part of the lab.")
+    opcode_pos, known_opcode = _lookup(lab_opcodes, opcode)
+    capable = np.zeros((len(machine_ids), len(lab_opcodes)), dtype=bool)
+    for opc, ids in lab.op_to_machine_ids.items():
+        for machine_id in ids:
+            m = np.flatnonzero(machine_ids == machine_id)
+            capable[m, np.searchsorted(lab_opcodes, opc)] = True
+    checked = known_machine & known_opcode
+    can = np.zeros(len(columns), dtype=bool)
+    can[checked] = capable[machine_pos[checked], opcode_pos[checked]]
+    report('incapable_machine', known_machine & ~can, "Machine {machine} cannot run opcode {opcode}.")
+    durations = np.array([lab.durations[opc] for opc in lab_opcodes], dtype=np.int64)
+    short = np.zeros(len(columns), dtype=bool)
+    short[known_opcode] = end[known_opcode] - start[known_opcode] < durations[opcode_pos[known_opcode]]
+    short |= start < 0
+    report('duration', short, "Step {step} of job {job} runs from {start} to {end}, shorter than its duration.")
+
+    # Precedence: consecutive steps of a job, in step order.
+    order = np.lexsort((step, job))
+    same_job = job[order][1:] == job[order][:-1]
+    early = same_job & (step[order][1:] != step[order][:-1]) & (start[order][1:] < end[order][:-1])
+    report('precedence', order[1:][early], "Step {step} of job {job} starts at {start} before the previous step ends.")
+
+    # Overlaps: every step must start after all earlier steps on its machine have ended. The running
+    # maximum of end times is taken per machine by offsetting each machine's group.
+    order = np.lexsort((start, machine))
+    if len(order):
+        m_sorted, s_sorted, e_sorted = machine[order], start[order], end[order]
+        group = np.r_[0, np.cumsum(m_sorted[1:] != m_sorted[:-1])]
+        low = min(int(e_sorted.min()), 0)
+        span = int(e_sorted.max()) - low + 1
+        running_end = np.maximum.accumulate(group * span + (e_sorted - low)) - group * span + low
+        overlap = (m_sorted[1:] == m_sorted[:-1]) & (s_sorted[1:] < running_end[:-1])
+        report('overlap', order[1:][overlap], "Machine {machine} is busy when step {step} of job {job} starts at {start}.")
+
+    if makespan is not None and len(columns) and makespan < end.max():
+        violations.append(Violation('makespan', -1, -1, -1,
+                                    f"Makespan {makespan} is smaller than the last completion time {end.max()}."))
+    return violations
+
+
+def verify_schedule(schedule, lab, jobs) -> list[Violation]:
+    """All constraint violations of a `ScheduleResult`, a `ColumnarSchedule` or a list of `Decision`,
+    see `verify_columns`."""
+    columns, makespan = schedule_columns(schedule, jobs)
+    job_ids = 'position' if isinstance(schedule, list) else 'idx'
+    return verify_columns(columns, lab, jobs, makespan, job_ids)
 
 
 class ScheduleVerifier:
@@ -6,30 +161,26 @@ class ScheduleVerifier:
         self.schedule = schedule
         self.lab = lab
         self.jobs = jobs
+        self._violations = None
+
+    def violations(self) -> list[Violation]:
+        if self._violations is None:
+            self._violations = verify_schedule(self.schedule, self.lab, self.jobs)
+        return self._violations
 
     def verify_job_steps(self):
         """Verify that each job has the correct steps in the correct order."""
-        sorted_schedule = sorted(self.schedule, key=lambda x: (x.job_id, x.starting_time))
-        for job_id, job_group in groupby(sorted_schedule, key=lambda x: x.job_id):
-            job = self.jobs[job_id]
-            job_steps = list(job_group)
-            if len(job_steps) != len(job):
-                return False
-            for i, op in enumerate(job):
-                if job_steps[i].operation != op:
-                    return False
-        return True
+        return not any(v.kind in JOB_STEP_KINDS for v in self.violations())
 
     def verify_machine_availabilities(self):
         """Verify that each machine is available when it is scheduled."""
-        sorted_schedule = sorted(self.schedule, key=lambda x: (x.machine_id, x.starting_time))
-        for machine_id, machine_group in groupby(sorted_schedule, key=lambda x: x.machine_id):
-            machine_steps = list(machine_group)
-            for i in range(len(machine_steps) - 1):
-                if machine_steps[i].completion_time > machine_steps[i + 1].starting_time:
-                    return False
-        return True
+        return not any(v.kind in MACHINE_KINDS for v in self.violations())
 
     def verify_all(self):
-        return self.verify_job_steps() and self.verify_machine_availabilities()
+        return not self.violations()
+
 
+def verify_result(result, lab, jobs) -> bool:
+    """Verify a `ScheduleResult`: every job step is scheduled exactly once on a machine that can run
+    it, steps of a job run in order without overlapping, and no machine runs two steps at once."""
+    return not verify_schedule(result, lab, jobs)
@@ -1,4 +1,3 @@
-import itertools
 import logging
 import matplotlib.pyplot as plt
 import numpy as np
@@ -14,9 +13,13 @@ from pathlib import Path
 from sdl.algorithm.scheduling.genetic import Chromosome, Individual, genetic_solve
 from sdl.lab import *
 from sdl.random.sdl import create_sdl
+from sdl.random.sweep import Sweep
 from sdl.plot import plotAll, renderSchedule
 from sdl.verify import ScheduleVerifier
-from sdl.storage import Storage
+from sdl.instances import InstanceStore
+from sdl.results import ResultsStore
+from sdl.runner import SweepRunner
+from sdl.storage import AsyncStorageWriter, Storage
 from time import perf_counter
 from typing import List, Dict
 
@@ -225,13 +228,9 @@ def dummy_heuristic_main(
         storage.set_data(lab, jobs, dummy_heuristic_schedule, makespan, end - start)
         storage.save()
 
-def load_schedule_from_file(filename):
-    storage = Storage(filename)
-    storage.load()
-    schedule = storage.data["schedule"]
-    machines = storage.data["machines"]
-    jobs = storage.data["jobs"]
-    op_durations = storage.data["durations"]
+def load_schedule_from_file(filename, instances: InstanceStore = None, fields: List[str] = None):
+    storage = Storage(filename, instances=instances)
+    storage.load(fields)
     makespan = storage.data["makespan"]
     runtime = storage.data['runtime']
     # print("reloaded makespan:", makespan)
@@ -264,7 +263,8 @@ def test_sdl_factory(filename):
     # genetic_main(machines, operation_pool, durations, jobs, random_state)
 
 
-def test_storage_plot_performance(fn, filename, csv_file):
+def test_storage_plot_performance(fn, filename, csv_file, instances: InstanceStore = None,
+                                  writer: AsyncStorageWriter = None):
     random_state = random.RandomState(101)
     p, m, n, o, steps_min, steps_max = 3, 5, 3, 20, 3, 6
     for i in range(10):
@@ -273,7 +273,7 @@ def test_storage_plot_performance(fn, filename, csv_file):
         durations = {
             op.opcode: op.duration for op in operations
         }
-        storage = Storage(filename=filename.format(index=i), csv_file=csv_file)
+        storage = Storage(filename=filename.format(index=i), csv_file=csv_file, instances=instances, writer=writer)
         storage.set_meta_data(p, m, n, o, steps_min, steps_max, i, algorithm_name=fn.__name__)
         # greedy_main(machines, operation_pool, durations, jobs, filename=f'data/greedy_schedule_makespan-{i}.pkl')
         # genetic_main(machines, operation_pool, durations, jobs, random_state, filename=f'data/genetic_makespan-{i}.pkl')
@@ -286,37 +286,56 @@ def test_storage_plot_performance(fn, filename, csv_file):
         steps_max += 4
 
 
-def test_sensitivity(fn, filename, csv_file):
-    random_state = random.RandomState(101)
-    # p, m, n, o, steps_min, steps_max = 3, 5, 3, 20, 3, 6
-    i = 0
-    p = 9
-    for m, n, o, n_steps in itertools.product(range(10, 101, 5),
-                                              range(10, 101, 5),
-                                              range(10, 101, 5),
-                                              range(10, 101, 5)):
-        steps_min, steps_max = n_steps, n_steps + 1
-        machines, jobs, operations, operations_to_machines = create_sdl(
-            p=p, m=m, n=n, o=o, steps_min=steps_min, steps_max=steps_max, random_state=random_state)
+# Parameter grid of `test_sensitivity`. `steps_min` and `steps_max` are one axis since jobs have a fixed length.
+SENSITIVITY_GRID = {
+    'p': [9],
+    'm': range(10, 101, 5),
+    'n': range(10, 101, 5),
+    'o': range(10, 101, 5),
+    ('steps_min', 'steps_max'): [(n_steps, n_steps + 1) for n_steps in range(10, 101, 5)],
+}
+
+
+def test_sensitivity(fn, filename, csv_file, results: ResultsStore = None, writer: AsyncStorageWriter = None,
+                     shard: int = 0, n_shards: int = 1, start: int = 0):
+    # Every instance is seeded by its grid point, so shards can run in separate processes.
+    sweep = Sweep(SENSITIVITY_GRID, seed=101)
+    for params, i, (machines, jobs, operations, operations_to_machines) in sweep.iter(shard, n_shards, start):
         durations = {
             op.opcode: op.duration for op in operations
         }
-        storage = Storage(filename=filename.format(index=i), csv_file=csv_file, save_pkl=False)
-        storage.set_meta_data(p, m, n, o, steps_min, steps_max, i, algorithm_name=fn.__name__)
+        storage = Storage(filename=filename.format(index=i), csv_file=csv_file, save_pkl=False, results=results,
+                          writer=writer)
+        storage.set_meta_data(params['p'], params['m'], params['n'], params['o'], params['steps_min'],
+                              params['steps_max'], i, algorithm_name=fn.__name__)
         # greedy_main(machines, operation_pool, durations, jobs, filename=f'data/greedy_schedule_makespan-{i}.pkl')
         # genetic_main(machines, operation_pool, durations, jobs, random_state, filename=f'data/genetic_makespan-{i}.pkl')
-        fn(machines, operations, durations, jobs, random_state, storage)
-        i += 1
+        fn(machines, operations, durations, jobs, sweep.random_state(sweep.coords(i), stream=1), storage)
         print('i:', i)
 
 
-def load_test_storage_performance(greedy_file_template, genetic_file_template):
+def run_sensitivity(experiments, checkpoint, results: ResultsStore, filename: str = '', n_workers: int = 8,
+                    timeout: float = 600, shard: int = 0, n_shards: int = 1):
+    """`test_sensitivity` for several experiments at once on `n_workers` processes. Rerunning with the
+    same `checkpoint` file skips the tasks that finished before."""
+    with SweepRunner(Sweep(SENSITIVITY_GRID, seed=101), experiments, checkpoint, filename=filename,
+                     save_pkl=bool(filename), results=results, n_workers=n_workers, timeout=timeout) as runner:
+        report = runner.run(shard, n_shards)
+    logging.info(f'{report.completed} tasks done, {report.skipped} skipped, {len(report.timed_out)} timed out '
+                 f'and {len(report.failed)} failed in {report.elapsed:.1f} seconds.')
+    return report
+
+
+def load_test_storage_performance(greedy_file_template, genetic_file_template, instances: InstanceStore = None):
     greedy_stores = []
     genetic_stores = []
     for i in range(10):
-        greedy_store = load_schedule_from_file(greedy_file_template.format(index=i))
+        # Archives (`.sdla`) only read the fields needed for the plots below.
+        greedy_store = load_schedule_from_file(greedy_file_template.format(index=i), instances,
+                                               ['makespan', 'runtime'])
         greedy_stores.append(greedy_store)
-        genetic_store = load_schedule_from_file(genetic_file_template.format(index=i))
+        genetic_store = load_schedule_from_file(genetic_file_template.format(index=i), instances,
+                                                ['makespan', 'runtime', 'makespan_history'])
         genetic_stores.append(genetic_store)
     greedy_makespans = [store.data['makespan'] for store in greedy_stores]
     genetic_makespans = [store.data['makespan'] for store in genetic_stores]
@@ -355,9 +374,14 @@ def load_test_storage_performance(greedy_file_template, genetic_file_template):
     plt.show()
 
 
-def compare_two_algorithm(alg1_csv_file, alg2_csv_file):
-    df1 = pd.read_csv(alg1_csv_file)
-    df2 = pd.read_csv(alg2_csv_file)
+def compare_two_algorithm(alg1_csv_file, alg2_csv_file, results: ResultsStore = None):
+    # With a results store, the two arguments are algorithm names instead of CSV files.
+    if results is not None:
+        df1 = results.read(algorithm=alg1_csv_file)
+        df2 = results.read(algorithm=alg2_csv_file)
+    else:
+        df1 = pd.read_csv(alg1_csv_file)
+        df2 = pd.read_csv(alg2_csv_file)
     alg1_makespans = df1['makespan'].values
     alg2_makespans = df2['makespan'].values
     alg1_runtimes = df1['runtime'].values
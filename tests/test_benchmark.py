@@ -0,0 +1,69 @@
+import json
+import os
+import queue
+import tempfile
+import unittest
+
+from sdl import benchmark
+
+
+class BenchmarkTestCase(unittest.TestCase):
+    def test_default_cases(self):
+        cases = benchmark.default_cases(['tiny', 'medium', 'ft06'])
+        self.assertIn(('ilp', 'tiny'), cases)
+        self.assertNotIn(('ilp', 'medium'), cases)
+        self.assertIn(('greedy', 'ft06'), cases)
+        self.assertNotIn(('partition:opt', 'ft06'), cases)
+        self.assertEqual({solver for solver, _ in cases}, set(benchmark.SOLVERS))
+
+    def test_tier_instances_are_seeded(self):
+        lab, jobs = benchmark.tier_instance('small')
+        again, jobs_again = benchmark.tier_instance('small')
+        self.assertEqual([[op.opcode for op in job] for job in jobs], [[op.opcode for op in job] for job in jobs_again])
+        self.assertTrue(all(lab.can_perform(job) for job in jobs))
+        sites, jobs = benchmark.tier_sites('tiny')
+        self.assertEqual(len(sites), benchmark.TIERS['tiny'].sites)
+        self.assertTrue(all(site.can_perform(job) for site in sites for job in jobs))
+
+    def test_history_and_regressions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            history = os.path.join(directory, 'history.jsonl')
+            cases = [('greedy', 'tiny'), ('dispatch', 'ft06')]
+            records, regressions = benchmark.run_benchmarks(cases, history, timeout=120, log=None)
+            self.assertEqual([record['status'] for record in records], ['ok', 'ok'])
+            self.assertEqual(regressions, [])
+            # Only the memory of the solve itself is counted, not that of the imports.
+            self.assertLess(records[0]['peak_memory_mb'], 20)
+
+            # A baseline that was much faster and better is flagged on the next run.
+            with open(history, 'a') as f:
+                f.write(json.dumps({**records[0], 'wall_time': records[0]['wall_time'] - 1,
+                                    'makespan': records[0]['makespan'] - 1}) + '\n')
+            records, regressions = benchmark.run_benchmarks(cases, history, timeout=120, log=None)
+            self.assertEqual(sorted(regression.metric for regression in regressions), ['makespan', 'wall_time'])
+            self.assertEqual(len(benchmark.read_history(history)), 5)
+
+    def test_case_with_prebuilt_instance(self):
+        # Where peak memory cannot be reset, the instance is built by the caller instead.
+        results = queue.Queue()
+        benchmark._run_case('greedy', 'tiny', results, benchmark.tier_instance('tiny'))
+        record = results.get_nowait()
+        self.assertEqual(record['status'], 'ok')
+        self.assertEqual(record['makespan'], benchmark.run_case('greedy', 'tiny', timeout=120)['makespan'])
+
+    def test_timeouts_are_regressions(self):
+        baseline = {'genetic/small': {'case': 'genetic/small', 'status': 'ok', 'wall_time': 3.0}}
+        regressions = benchmark.find_regressions([{'case': 'genetic/small', 'status': 'timeout'}], baseline)
+        self.assertEqual([regression.metric for regression in regressions], ['timeout'])
+
+    def test_memory_regressions(self):
+        baseline = {'grasp/medium': {'case': 'grasp/medium', 'status': 'ok', 'wall_time': 1.0,
+                                     'peak_memory_mb': 30.0, 'makespan': 100}}
+        records = [{**baseline['grasp/medium'], 'peak_memory_mb': memory} for memory in (120.0, 34.0)]
+        regressions = benchmark.find_regressions(records, baseline)
+        self.assertEqual([(regression.metric, regression.value) for regression in regressions],
+                         [('peak_memory_mb', 120.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import unittest
+
+from sdl.algorithm.scheduling import registry
+from sdl.algorithm.scheduling.io import SchedulingInstance
+from sdl.fjsp import benchmark_manifest, load_benchmark, read_fjs, write_fjs
+from sdl.verify import verify_result
+from test_factories import smallSDLInPaper
+
+FLEXIBLE = """2 3 1.5
+2  2 1 4 2 6  1 3 5
+3  1 2 3  2 1 2 3 4  2 2 2 3 2
+"""
+
+
+class FJSPTestCase(unittest.TestCase):
+    def test_read_flexible(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'flexible.fjs')
+            with open(path, 'w') as f:
+                f.write(FLEXIBLE)
+            for policy, durations in (('max', [6, 5, 3, 4, 2]), ('min', [4, 5, 3, 2, 2]), ('mean', [5, 5, 3, 3, 2])):
+                instance = read_fjs(path, policy)
+                self.assertEqual(instance.name, 'flexible')
+                self.assertEqual([op.duration for job in instance.jobs for op in job], durations)
+                machines = [instance.lab.op_to_machine_ids[op.opcode] for job in instance.jobs for op in job]
+                self.assertEqual(machines, [{1, 2}, {3}, {2}, {1, 3}, {2, 3}])
+
+    def test_round_trip(self):
+        lab, jobs, machines, durations, operations = smallSDLInPaper()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'paper.fjs')
+            write_fjs(path, lab, jobs)
+            instance = read_fjs(path)
+            rewritten = os.path.join(directory, 'rewritten.fjs')
+            write_fjs(rewritten, instance.lab, instance.jobs)
+            with open(path) as f, open(rewritten) as g:
+                self.assertEqual(f.read(), g.read())
+        self.assertEqual([[op.duration for op in job] for job in instance.jobs],
+                         [[op.duration for op in job] for job in jobs])
+
+    def test_benchmarks(self):
+        manifest = benchmark_manifest()
+        self.assertTrue({'ft06', 'la01', 'la02', 'la03', 'la04', 'la05'} <= set(manifest))
+        # Best-known makespans only carry over to the collapsed lab for non-flexible instances.
+        self.assertTrue(all('flexible' in entry for entry in manifest.values()))
+        for name, entry in manifest.items():
+            instance = load_benchmark(name)
+            self.assertEqual((len(instance.jobs), len(instance.lab.machines)), (entry['jobs'], entry['machines']))
+            self.assertEqual(instance.best_known, entry['best_known'])
+            result = registry.solve('grasp', SchedulingInstance(instance.lab, instance.jobs))
+            self.assertTrue(verify_result(result, instance.lab, instance.jobs))
+            self.assertGreaterEqual(result.makespan, instance.best_known)
+
+        instance = load_benchmark('ft06')
+        result = registry.solve('ilp', SchedulingInstance(instance.lab, instance.jobs))
+        self.assertTrue(verify_result(result, instance.lab, instance.jobs))
+        self.assertEqual(result.makespan, instance.best_known)
+
+    def test_flexible_benchmarks_have_no_best_known(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'flexible.fjs'), 'w') as f:
+                f.write(FLEXIBLE)
+            with open(os.path.join(directory, 'manifest.json'), 'w') as f:
+                json.dump({'flexible': {'file': 'flexible.fjs', 'format': 'fjs', 'jobs': 2, 'machines': 3,
+                                        'flexible': True, 'best_known': 9}}, f)
+            instance = load_benchmark('flexible', directory=directory)
+            self.assertEqual(len(instance.jobs), 2)
+            self.assertIsNone(instance.best_known)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+from numpy.random import RandomState
+
+from sdl.algorithm.partition.cache import ScheduleCache
+from sdl.algorithm.partition.column_generation import column_generation_partition
+from sdl.algorithm.partition.evaluate import SiteEvaluator
+from sdl.algorithm.partition.feasibility import feasibility_matrix
+from sdl.algorithm.partition.io import PartitionDecisions, validate_partitions
+from sdl.algorithm.partition.local_search import improve_partition
+from sdl.algorithm.partition.opt import opt_partition
+from sdl.algorithm.partition.random import multistart_random_partition, random_partition
+from sdl.algorithm.scheduling import grasp
+from sdl.lab import Job, Machine, Operation, SDLLab
+from test_factories import smallSDLInPaper, smallSDLForPartition
+
+
+def two_sites():
+    lab, jobs, machines, durations, operations = smallSDLInPaper()
+    lab2, jobs2, machines2, durations2, operations2 = smallSDLForPartition()
+    return [lab, lab2], jobs + jobs2
+
+
+class PartitionTestCase(unittest.TestCase):
+    def test_opt_partition(self):
+        sites, jobs = two_sites()
+        decs = opt_partition(sites, jobs, grasp.solve)
+        # Job 4 can only run on the second site and takes 28 time units on its own.
+        self.assertEqual(decs.makespan, 28)
+        self.assertEqual(sorted(job.idx for site_jobs in decs.matching.values() for job in site_jobs),
+                         [job.idx for job in jobs])
+        self.assertTrue(validate_partitions(sites, jobs, decs, grasp.solve))
+
+    def test_column_generation_partition(self):
+        sites, jobs = two_sites()
+        decs = column_generation_partition(sites, jobs, grasp.solve)
+        self.assertEqual(decs.makespan, 28)
+        self.assertTrue(validate_partitions(sites, jobs, decs, grasp.solve))
+
+    def test_improve_partition(self):
+        sites, jobs = two_sites()
+        # Everything the second site can do is put there, which overloads it.
+        start = PartitionDecisions(makespan=0, matching={0: [], 1: jobs})
+        decs = improve_partition(sites, jobs, start, grasp.solve, random_state=RandomState(0))
+        self.assertEqual(decs.makespan, 28)
+        self.assertTrue(validate_partitions(sites, jobs, decs, grasp.solve))
+
+    def test_schedule_cache(self):
+        sites, jobs = two_sites()
+        cache = ScheduleCache(maxsize=2)
+        decs = random_partition(sites, jobs, grasp.solve, random_state=RandomState(0), cache=cache)
+        # The validator reuses the makespans computed by the partitioner.
+        self.assertEqual(cache.stats, {'hits': 2, 'misses': 2, 'size': 2, 'maxsize': 2})
+        self.assertTrue(validate_partitions(sites, jobs, decs, grasp.solve, cache))
+        self.assertEqual(cache.hits, 4)
+        cache.makespan(grasp.solve, 0, sites[0], jobs[:1])
+        self.assertEqual(len(cache), 2)
+
+        # Schedulers with the same qualified name, e.g. lambdas from one line, get separate entries.
+        padded = [lambda site, site_jobs, pad=pad: (grasp.solve(site, site_jobs).makespan + pad,) for pad in (0, 100)]
+        cache = ScheduleCache()
+        self.assertEqual([cache.makespan(scheduler, 0, sites[0], jobs[:1]) for scheduler in padded],
+                         [grasp.solve(sites[0], jobs[:1]).makespan + pad for pad in (0, 100)])
+
+    def test_site_evaluator(self):
+        sites, jobs = two_sites()
+        decs = random_partition(sites, jobs, grasp.solve, random_state=RandomState(0))
+        with SiteEvaluator(sites, n_workers=2) as evaluator:
+            makespans = evaluator.makespans(grasp.solve, decs.matching)
+            self.assertEqual(max(makespans.values()), decs.makespan)
+            self.assertTrue(validate_partitions(sites, jobs, decs, grasp.solve, evaluator=evaluator))
+            self.assertEqual(evaluator.cache.hits, 2)
+        self.assertEqual(opt_partition(sites, jobs, grasp.solve, n_workers=2).makespan, 28)
+
+    def test_feasibility_matrix(self):
+        sites, jobs = two_sites()
+        feasible = feasibility_matrix(sites, jobs)
+        self.assertEqual(feasible.tolist(), [[site.can_perform(job) for site in sites] for job in jobs])
+        self.assertFalse(feasible.flags.writeable)
+
+        # Opcodes beyond the first 64-bit word.
+        ops = [Operation(opcode, f'O_{opcode}', 1) for opcode in range(100)]
+        sites = [SDLLab([Machine(1, 'M_1', set(ops[:70]))], set(ops)), SDLLab([Machine(1, 'M_1', set(ops))], set(ops))]
+        jobs = [Job(1, 'J_1', [ops[0], ops[69]]), Job(2, 'J_2', [ops[99]])]
+        self.assertEqual(feasibility_matrix(sites, jobs).tolist(), [[True, True], [False, True]])
+
+    def test_multistart_random_partition(self):
+        sites, jobs = two_sites()
+        result = multistart_random_partition(sites, jobs, grasp.solve, n_samples=8, seed=0)
+        self.assertEqual(len(result.makespans), 8)
+        self.assertEqual(result.best.makespan, min(result.makespans))
+        self.assertEqual(result.makespans[result.best_sample], result.best.makespan)
+        # Samples do not depend on the number of samples drawn or on the number of workers.
+        parallel = multistart_random_partition(sites, jobs, grasp.solve, n_samples=4, seed=0, n_workers=2)
+        self.assertEqual(parallel.makespans, result.makespans[:4])
+
+
+if __name__ == '__main__':
+    unittest.main()
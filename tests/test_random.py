@@ -0,0 +1,108 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from numpy.random import RandomState
+
+from sdl.algorithm.scheduling import dispatch
+from sdl.random.bulk import bulk_sdl
+from sdl.random.machine import bipartite_machine_operation_matching, nx, sparse_machine_operation_matching
+from sdl.random.sweep import Sweep
+from sdl.verify import verify_schedule
+
+
+class BulkInstanceTestCase(unittest.TestCase):
+    def test_reproducible(self):
+        a, b = bulk_sdl(3, 8, 50, 20, 3, 7, RandomState(0)), bulk_sdl(3, 8, 50, 20, 3, 7, RandomState(0))
+        for name in ('capable', 'durations', 'offsets', 'opcodes'):
+            self.assertTrue(np.array_equal(getattr(a, name), getattr(b, name)))
+        self.assertFalse(np.array_equal(a.opcodes, bulk_sdl(3, 8, 50, 20, 3, 7, RandomState(1)).opcodes))
+        # Every operation can run somewhere and the first `p` machines split the operations.
+        self.assertTrue(a.capable.any(axis=0).all())
+        self.assertTrue((a.capable[:3].sum(axis=0) == 1).all())
+
+    def test_few_operations(self):
+        for o in (1, 2, 3):
+            instance = bulk_sdl(1, 4, 5, o, 1, 3, RandomState(0))
+            self.assertEqual(instance.capable.shape, (4, o))
+            self.assertTrue((instance.capable[1:].sum(axis=1) == 1).all())
+        with self.assertRaises(ValueError):
+            bulk_sdl(0, 4, 5, 3, 1, 3, RandomState(0))
+        with self.assertRaises(ValueError):
+            bulk_sdl(1, 4, 5, 3, 3, 3, RandomState(0))
+
+    def test_compile_matches_objects(self):
+        instance = bulk_sdl(3, 8, 50, 20, 3, 7, RandomState(0))
+        compiled = instance.compile()
+        result = dispatch.dispatch(compiled, columnar=True)
+        self.assertEqual(instance.jobs.n_built, 0)
+
+        reference = dispatch.compile_instance(instance.lab, list(instance.jobs))
+        for name in ('machine_ids', 'durations', 'remaining', 'eligible', 'flexibility', 'n_ops'):
+            self.assertEqual(getattr(compiled, name), getattr(reference, name))
+        self.assertTrue(np.array_equal(result.rows, dispatch.dispatch(reference, columnar=True).rows))
+        self.assertEqual(verify_schedule(result, instance.lab, list(instance.jobs)), [])
+        self.assertEqual(pickle.loads(pickle.dumps(compiled)).eligible, compiled.eligible)
+
+
+class BipartiteMatchingTestCase(unittest.TestCase):
+    def test_sparse_matching(self):
+        for num_machines, num_operations, avg_degree in ((5, 4, 1), (7, 30, 3), (40, 60, 2.5), (10, 10, 50)):
+            eligibility = sparse_machine_operation_matching(num_machines, num_operations, avg_degree, RandomState(0))
+            dense = eligibility.to_dense()
+            self.assertEqual(dense.sum(), eligibility.num_edges)
+            self.assertEqual(eligibility.num_edges, min(int(avg_degree * (num_machines + num_operations)),
+                                                        num_machines * num_operations))
+            self.assertTrue(dense.any(axis=0).all() and dense.any(axis=1).all())
+            for k in range(num_machines):
+                self.assertTrue(np.all(np.diff(eligibility.row(k)) > 0))
+        first, second = (sparse_machine_operation_matching(40, 60, 2.5, RandomState(0)) for _ in range(2))
+        self.assertTrue(np.array_equal(first.indices, second.indices))
+
+    def test_machines_have_operations(self):
+        machines = bipartite_machine_operation_matching(7, 30, 3, RandomState(0))
+        eligibility = sparse_machine_operation_matching(7, 30, 3, RandomState(0))
+        self.assertEqual([sorted(op.opcode - 1 for op in machine.ops) for machine in machines],
+                         [eligibility.row(k).tolist() for k in range(7)])
+        self.assertTrue(all(5 <= op.duration < 50 for machine in machines for op in machine.ops))
+        self.assertTrue(all(op.name == f'o-{op.opcode}' for machine in machines for op in machine.ops))
+
+    @unittest.skipIf(nx is None, "networkx is not installed")
+    def test_graph(self):
+        g = bipartite_machine_operation_matching(7, 30, 3, RandomState(0), return_graph=True)
+        eligibility = sparse_machine_operation_matching(7, 30, 3, RandomState(0))
+        self.assertEqual(g.number_of_edges(), eligibility.num_edges)
+        self.assertEqual(sorted(g.neighbors('m-2'), key=lambda node: int(node[2:])),
+                         [f'o-{k}' for k in eligibility.row(2)])
+
+
+class SweepTestCase(unittest.TestCase):
+    grid = {'p': [2], 'm': [4, 6], 'n': [5, 8, 10], 'o': [8, 12], ('steps_min', 'steps_max'): [(2, 4), (3, 6)]}
+
+    def test_shards_match_full_sweep(self):
+        sweep = Sweep(self.grid, seed=7, generate=bulk_sdl)
+        full = list(sweep)
+        self.assertEqual([index for _, index, _ in full], list(range(24)))
+        self.assertEqual(full[5][0], {'p': 2, 'm': 4, 'n': 8, 'o': 8, 'steps_min': 3, 'steps_max': 6})
+        shards = [point for shard in range(3) for point in sweep.iter(shard, 3)]
+        self.assertEqual(sorted(index for _, index, _ in shards), list(range(24)))
+        for params, index, instance in shards + list(sweep.iter(start=17)):
+            self.assertEqual(params, full[index][0])
+            self.assertTrue(np.array_equal(instance.opcodes, full[index][2].opcodes))
+            self.assertTrue(np.array_equal(instance.capable, sweep.instance(index).capable))
+        self.assertEqual([index for _, index, _ in sweep.iter(1, 4, start=10)], [13, 17, 21])
+
+    def test_create_sdl_instances(self):
+        sweep = Sweep(self.grid, seed=7)
+        machines, jobs, operations, _ = sweep.instance(11)
+        params = sweep.params(sweep.coords(11))
+        self.assertEqual((len(machines), len(jobs), len(operations)), (params['m'], params['n'], params['o']))
+        _, _, (_, again, _, _) = next(sweep.iter(start=11))
+        self.assertEqual([[op.opcode for op in job] for job in jobs], [[op.opcode for op in job] for job in again])
+        self.assertNotEqual(sweep.random_state((0, 0, 0, 0, 0)).randint(1 << 30),
+                            sweep.random_state((0, 0, 0, 0, 0), stream=1).randint(1 << 30))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import pickle
+import tempfile
+import time
+import unittest
+
+from sdl.algorithm.scheduling import grasp
+from sdl.instances import InstanceStore
+from sdl.lab import SDLLab
+from sdl.random.sweep import Sweep
+from sdl.results import ResultsStore
+from sdl.runner import Checkpoint, SweepRunner
+
+GRID = {'p': [2], 'm': [4, 5], 'n': [5], 'o': [8, 10], ('steps_min', 'steps_max'): [(2, 4)]}
+
+
+def solve_grasp(machines, operations, durations, jobs, random_state, storage):
+    lab = SDLLab(machines, set(operations), durations)
+    result = grasp.solve(lab, jobs)
+    storage.set_data(lab, jobs, result, result.makespan, 0.0)
+    storage.save()
+
+
+def slow_on_odd(machines, operations, durations, jobs, random_state, storage):
+    if storage.meta_data['index'][0] % 2:
+        time.sleep(60)
+    solve_grasp(machines, operations, durations, jobs, random_state, storage)
+
+
+def fail(machines, operations, durations, jobs, random_state, storage):
+    raise ValueError('no schedule')
+
+
+class SweepRunnerTestCase(unittest.TestCase):
+    def test_resumable_sweep(self):
+        sweep = Sweep(GRID, seed=3)
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'sweep.ckpt')
+            results = ResultsStore(os.path.join(directory, 'results.db'), batch_size=3)
+            with SweepRunner(sweep, [solve_grasp, slow_on_odd, fail], checkpoint, results=results,
+                             filename=os.path.join(directory, '{algorithm}-{index}.sdla'), save_pkl=True,
+                             n_workers=3, timeout=2) as runner:
+                report = runner.run()
+            self.assertEqual(report.completed, 6)
+            self.assertEqual(sorted(report.timed_out), ['slow_on_odd:1', 'slow_on_odd:3'])
+            self.assertEqual(sorted(report.failed), [f'fail:{index}' for index in range(4)])
+            self.assertIn('no schedule', report.failed['fail:0'])
+            self.assertLess(report.elapsed, 30)
+            rows = results.read(['index', 'algorithm', 'makespan'])
+            self.assertEqual(sorted(zip(rows['algorithm'], rows['index'])),
+                             [('slow_on_odd', 0), ('slow_on_odd', 2)] + [('solve_grasp', index) for index in range(4)])
+            self.assertTrue(os.path.exists(os.path.join(directory, 'solve_grasp-3.sdla')))
+
+            # A restart skips everything recorded, including timeouts and failures.
+            with SweepRunner(sweep, [solve_grasp, slow_on_odd, fail], checkpoint, results=results) as runner:
+                report = runner.run()
+            self.assertEqual((report.completed, report.skipped), (0, 12))
+            self.assertEqual(len(results.read()), 6)
+
+            # An interrupted run that lost its last checkpoint lines only redoes those tasks.
+            with open(checkpoint) as f:
+                lines = [line for line in f if line.startswith('solve_grasp')]
+            with open(checkpoint, 'w') as f:
+                f.writelines(lines[:-1])
+                f.write(lines[-1].rstrip('\n'))
+            with SweepRunner(sweep, [solve_grasp], checkpoint, results=results, n_workers=2) as runner:
+                self.assertEqual(len(runner.checkpoint.done()), 3)
+                report = runner.run()
+            self.assertEqual(report.completed, 1)
+            # The torn line was cut off, so the redone task was appended as a line of its own.
+            with open(checkpoint) as f:
+                lines = f.readlines()
+            self.assertEqual(sorted(lines), sorted(f'solve_grasp:{index}\tok\n' for index in range(4)))
+            reopened = Checkpoint(checkpoint)
+            self.assertEqual(reopened.done(), {f'solve_grasp:{index}' for index in range(4)})
+            reopened.close()
+            results.close()
+
+    def test_runs_reference_stored_instances(self):
+        sweep = Sweep(GRID, seed=3)
+        with tempfile.TemporaryDirectory() as directory:
+            instances = InstanceStore(os.path.join(directory, 'instances'))
+            with SweepRunner(sweep, [solve_grasp], os.path.join(directory, 'sweep.ckpt'), save_pkl=True,
+                             csv_file=os.path.join(directory, 'runs.csv'), instances=instances,
+                             filename=os.path.join(directory, '{algorithm}-{index}.pkl'), n_workers=2) as runner:
+                self.assertEqual(runner.run().completed, 4)
+            with open(os.path.join(directory, 'solve_grasp-0.pkl'), 'rb') as f:
+                data = pickle.load(f)
+            self.assertEqual(set(data) - {'schedule', 'makespan', 'runtime', 'meta_data'}, {'instance'})
+            self.assertIn(data['instance'], instances)
+            lab, jobs = instances.get(data['instance'])
+            self.assertEqual(len(jobs), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
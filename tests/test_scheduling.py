@@ -0,0 +1,172 @@
+import gc
+import pickle
+import numpy as np
+import unittest
+
+from dataclasses import replace
+from numpy.random import RandomState
+from time import perf_counter
+
+from sdl.algorithm.scheduling import beam_search, dispatch, grasp, registry
+from sdl.algorithm.scheduling.annealing import anneal_solve
+from sdl.algorithm.scheduling.io import ColumnarSchedule, SchedulingInstance
+from sdl.algorithm.scheduling.portfolio import evaluate_portfolio
+from sdl.lab import _OPERATIONS, Decision, Job, Machine, MachineSchedule, Operation, SDLLab, intern_operation
+from sdl.random.bulk import bulk_sdl
+from sdl.verify import ScheduleVerifier, verify_result, verify_schedule
+from test_factories import smallSDLInPaper
+
+
+class SchedulingTestCase(unittest.TestCase):
+    def test_annealing_reaches_optimum(self):
+        lab, jobs, machines, durations, operations = smallSDLInPaper()
+        makespan, sjs, ms, chromosome, history = anneal_solve(lab, jobs, RandomState(0), max_iterations=3000)
+        self.assertEqual(makespan, 17)
+        self.assertEqual(history[-1], makespan)
+        self.assertEqual(sum(len(m) for m in ms), sum(len(job) for job in jobs))
+
+    def test_parallel_tempering(self):
+        lab, jobs, machines, durations, operations = smallSDLInPaper()
+        makespan, _, _, _, history = anneal_solve(lab, jobs, RandomState(1), max_iterations=2000,
+                                                  steps_per_round=500, n_replicas=3, n_workers=2)
+        self.assertEqual(makespan, 17)
+        self.assertEqual(sorted(history, reverse=True), history)
+
+    def test_beam_search(self):
+        lab, jobs, machines, durations, operations = smallSDLInPaper()
+        for width in (1, 4):
+            result = beam_search.solve(lab, jobs, beam_width=width)
+            self.assertEqual(result.makespan, 17)
+            for machine_id, slots in result.machine_schedules.items():
+                for prev, cur in zip(slots, slots[1:]):
+                    self.assertLessEqual(prev.end_time, cur.start_time)
+            for job in jobs:
+                self.assertNotIn((-1, 0), result.job_schedules[job.idx])
+        with self.assertRaises(ValueError):
+            beam_search.solve(SDLLab([], set(operations), durations), jobs)
+
+    def test_dispatch_rules(self):
+        lab, jobs, machines, durations, operations = smallSDLInPaper()
+        instance = dispatch.compile_instance(lab, jobs)
+        for rule in dispatch.DISPATCH_RULES:
+            for machine_rule in dispatch.MACHINE_RULES:
+                result = dispatch.dispatch(instance, rule, machine_rule)
+                self.assertGreaterEqual(result.makespan, 17)
+                for job in jobs:
+                    steps = result.job_schedules[job.idx]
+                    for step, (prev, cur) in enumerate(zip(steps, steps[1:])):
+                        self.assertGreaterEqual(cur[1], prev[1] + durations[job.ops[step].opcode])
+                for slots in result.machine_schedules.values():
+                    for prev, cur in zip(slots, slots[1:]):
+                        self.assertLessEqual(prev.end_time, cur.start_time)
+
+    def test_dispatch_scales_with_many_opcodes(self):
+        # Picking the next job must not scan every group of eligible machines: with 2000 opcodes
+        # there are about as many groups, and a linear scan over them took several seconds here.
+        instance = bulk_sdl(5, 20, 4_000, 2_000, 3, 8, RandomState(0))
+        compiled = instance.compile()
+        for machine_rule in ('first', 'earliest_finish'):
+            start = perf_counter()
+            result = dispatch.dispatch(compiled, 'MWKR', machine_rule, columnar=True)
+            self.assertLess(perf_counter() - start, 5)
+            self.assertEqual(verify_schedule(result, instance.lab, list(instance.jobs)), [])
+
+    def test_portfolio(self):
+        lab, jobs, machines, durations, operations = smallSDLInPaper()
+        serial = evaluate_portfolio(lab, jobs)
+        parallel = evaluate_portfolio(lab, jobs, n_workers=2)
+        self.assertEqual(len(serial.makespans), len(dispatch.DISPATCH_RULES) * len(dispatch.MACHINE_RULES))
+        self.assertEqual(serial.makespans, parallel.makespans)
+        self.assertEqual(serial.best.makespan, min(serial.makespans.values()))
+        self.assertEqual(parallel.best.makespan, serial.best.makespan)
+
+    def test_registry_returns_verified_schedules(self):
+        lab, jobs, machines, durations, operations = smallSDLInPaper()
+        instance = SchedulingInstance(lab, jobs)
+        for name in ('greedy', 'list_scheduling', 'dummy_heuristic', 'grasp', 'beam_search', 'dispatch', 'ilp'):
+            result = registry.solve(name, instance, budget=10)
+            self.assertTrue(verify_result(result, lab, jobs), name)
+        result = registry.solve('genetic', instance, budget=10, random_state=RandomState(0), max_generations=20)
+        self.assertTrue(verify_result(result, lab, jobs))
+
+        broken = registry.solve('grasp', instance)
+        slots = broken.machine_schedules[1]
+        slots[0] = MachineSchedule(slots[0].job_id, slots[0].job_step, slots[0].operation,
+                                   slots[0].start_time + 1, slots[0].end_time)
+        self.assertFalse(verify_result(broken, lab, jobs))
+
+    def test_verify_schedule(self):
+        lab, jobs, machines, durations, operations = smallSDLInPaper()
+        result = grasp.solve(lab, jobs)
+        self.assertEqual(verify_schedule(result, lab, jobs), [])
+        position = {job.idx: e for e, job in enumerate(jobs)}
+        decisions = [Decision(position[slot.job_id], slot.operation, machine_id, slot.start_time, slot.end_time,
+                              slot.end_time - slot.start_time)
+                     for machine_id, slots in result.machine_schedules.items() for slot in slots]
+        self.assertTrue(ScheduleVerifier(decisions, lab, jobs).verify_all())
+        # The ILP solver reports float times that are slightly off.
+        noisy = [replace(d, starting_time=d.starting_time - 1e-7, completion_time=d.completion_time - 1e-7)
+                 for d in decisions]
+        self.assertTrue(ScheduleVerifier(noisy, lab, jobs).verify_all())
+
+        # Move the first step on machine 1 to start one unit later and run it again on another machine.
+        slot = result.machine_schedules[1][0]
+        result.machine_schedules[1][0] = MachineSchedule(slot.job_id, slot.job_step, slot.operation,
+                                                         slot.start_time + 1, slot.end_time)
+        other = next(m for m in lab.machines if m.idx != 1 and not m.has_operation(slot.operation))
+        result.machine_schedules[other.idx].append(slot)
+        kinds = {violation.kind for violation in verify_schedule(result, lab, jobs)}
+        self.assertTrue({'duplicate', 'duration', 'incapable_machine'} <= kinds)
+
+    def test_columnar_schedule(self):
+        lab, jobs, machines, durations, operations = smallSDLInPaper()
+        result = dispatch.solve(lab, jobs)
+        columnar = dispatch.solve(lab, jobs, columnar=True)
+        self.assertEqual(columnar.makespan, result.makespan)
+        self.assertEqual(verify_schedule(columnar, lab, jobs), [])
+        self.assertEqual(columnar.to_result(lab, jobs), result)
+        self.assertEqual(pickle.loads(pickle.dumps(columnar)).rows.tolist(), columnar.rows.tolist())
+
+        rows = columnar.machine(1)
+        self.assertTrue(np.shares_memory(rows, columnar.rows))
+        self.assertEqual([(r['job'], r['start']) for r in rows], [(s.job_id, s.start_time)
+                                                                  for s in result.machine_schedules[1]])
+        job = jobs[0]
+        self.assertEqual(columnar.job(job.idx)['step'].tolist(), list(range(len(job))))
+        self.assertEqual(ColumnarSchedule.from_result(result).rows.tolist(), columnar.rows.tolist())
+
+    def test_interned_operations(self):
+        op = intern_operation(1, 'A', 5)
+        self.assertIs(intern_operation(1, 'A', 5), op)
+        slot = pickle.loads(pickle.dumps(MachineSchedule(1, 0, op, 0, 5)))
+        self.assertIs(slot.operation, op)
+        self.assertFalse(hasattr(slot, '__dict__'))
+        # Operations nothing refers to any more are dropped from the intern table.
+        intern_operation(2, 'B', 5)
+        gc.collect()
+        self.assertNotIn((2, 'B', 5), _OPERATIONS)
+
+    def test_legacy_pickles(self):
+        # `(Job, Machine, MachineSchedule)` pickled before the lab classes had slots.
+        legacy = (b'\x80\x04\x95\xfe\x00\x00\x00\x00\x00\x00\x00\x8c\x07sdl.lab\x94\x8c\x03Job\x94\x93\x94)\x81'
+                  b'\x94}\x94(\x8c\x03idx\x94K\x01\x8c\x04name\x94\x8c\x03J_1\x94\x8c\x03ops\x94]\x94h\x00\x8c\t'
+                  b'Operation\x94\x93\x94)\x81\x94}\x94(\x8c\x06opcode\x94K\x03h\x06\x8c\x04OP_3\x94\x8c\x08'
+                  b'duration\x94K\x07ubaubh\x00\x8c\x07Machine\x94\x93\x94)\x81\x94}\x94(h\x05K\x02h\x06\x8c\x03M_2'
+                  b'\x94h\x08\x8f\x94(h\x0c\x90ubh\x00\x8c\x0fMachineSchedule\x94\x93\x94)\x81\x94}\x94(\x8c\x06'
+                  b'job_id\x94K\x01\x8c\x08job_step\x94K\x00\x8c\toperation\x94h\x0c\x8c\nstart_time\x94K\x00\x8c'
+                  b'\x08end_time\x94K\x07ub\x87\x94.')
+        job, machine, slot = pickle.loads(legacy)
+        op = Operation(3, 'OP_3', 7)
+        self.assertEqual(job, Job(1, 'J_1', [op]))
+        self.assertEqual(machine, Machine(2, 'M_2', {op}))
+        self.assertEqual(slot, MachineSchedule(1, 0, op, 0, 7))
+        self.assertIs(slot.operation, job.ops[0])
+
+    def test_race(self):
+        lab, jobs, machines, durations, operations = smallSDLInPaper()
+        result = registry.race(SchedulingInstance(lab, jobs), budget=2, solvers=('grasp', 'greedy', 'dispatch'))
+        self.assertEqual(result.makespan, 17)
+
+
+if __name__ == '__main__':
+    unittest.main()
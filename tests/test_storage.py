@@ -0,0 +1,158 @@
+import os
+import tempfile
+import unittest
+
+from numpy.random import RandomState
+
+from sdl import results as results_module
+from sdl.algorithm.scheduling import grasp
+from sdl.archive import ScheduleArchive, scan_archives
+from sdl.instances import InstanceStore, instance_hash
+from sdl.lab import SDLLab
+from sdl.random.sdl import create_sdl
+from sdl.results import ResultsStore
+from sdl.storage import AsyncStorageWriter, Storage
+from test_factories import smallSDLInPaper
+
+
+def run_row(index, algorithm):
+    return {'index': index, 'partitions': 3, 'n_machines': 5, 'n_jobs': 10 + index, 'n_operations': 20,
+            'steps_min': 3, 'steps_max': 6, 'algorithm': algorithm, 'makespan': 100 - index, 'runtime': 0.5}
+
+
+class ResultsStoreTestCase(unittest.TestCase):
+    def check_backend(self, path, backend):
+        with ResultsStore(path, batch_size=3, backend=backend) as store:
+            for i in range(5):
+                store.append(run_row(i, 'greedy_main'))
+                store.append(run_row(i, 'grasp_main'))
+            # Three full batches were written, one row is still buffered.
+            self.assertEqual(len(store.buffer), 1)
+            greedy = store.read(algorithm='greedy_main')
+            self.assertEqual(greedy['makespan'].tolist(), [100, 99, 98, 97, 96])
+            self.assertEqual(store.read(['n_jobs'], algorithm='grasp_main', index=2)['n_jobs'].tolist(), [12])
+        with ResultsStore(path, backend=backend) as store, ResultsStore(path, backend=backend) as other:
+            self.assertEqual(len(store.read()), 10)
+            # Float ILP makespans are rounded, and two stores writing at once keep both rows.
+            store.append({**run_row(5, 'ilp_main'), 'makespan': 16.9999999})
+            other.append(run_row(6, 'ilp_main'))
+            store.flush()
+            other.flush()
+            self.assertEqual(store.read(['makespan'], algorithm='ilp_main')['makespan'].tolist(), [17, 94])
+
+    def test_sqlite(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.check_backend(os.path.join(directory, 'results.db'), 'sqlite')
+
+    @unittest.skipIf(results_module.pa is None, "pyarrow is not installed")
+    def test_parquet(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.check_backend(os.path.join(directory, 'results'), 'parquet')
+
+    def test_storage_writes_to_results_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with ResultsStore(os.path.join(directory, 'results.db'), batch_size=10) as store:
+                for i in range(3):
+                    storage = Storage(save_pkl=False, results=store)
+                    storage.set_meta_data(3, 5, 10, 20, 3, 6, i, algorithm_name='greedy_main')
+                    storage.data = {'makespan': 50 + i, 'runtime': 0.1}
+                    storage.save()
+                self.assertEqual(store.read(['makespan'])['makespan'].tolist(), [50, 51, 52])
+
+
+class InstanceStoreTestCase(unittest.TestCase):
+    def test_instance_hash_is_canonical(self):
+        lab, jobs, machines, durations, operations = smallSDLInPaper()
+        reordered = SDLLab(list(reversed(machines)), set(reversed(list(operations))), dict(reversed(durations.items())))
+        self.assertEqual(instance_hash(lab, jobs), instance_hash(reordered, jobs))
+        self.assertNotEqual(instance_hash(lab, jobs), instance_hash(lab, jobs[:-1]))
+
+    def test_runs_share_one_instance(self):
+        machines, jobs, operations, _ = create_sdl(3, 5, 8, 20, 3, 6, random_state=RandomState(0))
+        lab = SDLLab(machines, set(operations), {op.opcode: op.duration for op in operations})
+        with tempfile.TemporaryDirectory() as directory:
+            instances = InstanceStore(os.path.join(directory, 'instances'))
+            for name in ('greedy', 'grasp'):
+                storage = Storage(os.path.join(directory, f'{name}.pkl'), save_pkl=True, instances=instances,
+                                  results=ResultsStore(os.path.join(directory, 'results.db')))
+                storage.set_meta_data(3, 5, 8, 20, 3, 6, 0, algorithm_name=name)
+                result = grasp.solve(lab, jobs)
+                storage.set_data(lab, jobs, result, result.makespan, 0.1)
+                storage.save()
+                storage.results.close()
+            self.assertEqual(len(os.listdir(os.path.join(directory, 'instances'))), 1)
+
+            # A fresh store loads the instance once for both runs.
+            instances = InstanceStore(os.path.join(directory, 'instances'))
+            loaded = [Storage(os.path.join(directory, f'{name}.pkl'), instances=instances).load()
+                      for name in ('greedy', 'grasp')]
+            self.assertIs(loaded[0]['jobs'], loaded[1]['jobs'])
+            self.assertEqual([job.idx for job in loaded[0]['jobs']], [job.idx for job in jobs])
+            with self.assertRaises(ValueError):
+                Storage(os.path.join(directory, 'grasp.pkl')).load()
+
+            # Changing the jobs list after storing it stores a new instance.
+            key = instances.put(lab, jobs)
+            jobs.pop()
+            self.assertNotEqual(instances.put(lab, jobs), key)
+            instances = InstanceStore(os.path.join(directory, 'instances'), max_loaded=1)
+            self.assertIs(instances.get(key), instances.get(key))
+            instances.get(instances.put(lab, jobs))
+            self.assertEqual(list(instances._loaded), [instance_hash(lab, jobs)])
+
+
+class ArchiveTestCase(unittest.TestCase):
+    def test_archive_round_trip(self):
+        lab, jobs, machines, durations, operations = smallSDLInPaper()
+        result = grasp.solve(lab, jobs)
+        with tempfile.TemporaryDirectory() as directory:
+            for i in range(3):
+                storage = Storage(os.path.join(directory, f'run-{i}.sdla'), results=ResultsStore(':memory:', backend='sqlite'))
+                storage.set_meta_data(1, 3, 3, 4, 3, 3, i, algorithm_name='grasp')
+                storage.set_data(lab, jobs, result, result.makespan + i, 0.1)
+                storage.set_makespan_genetic_history([30, 20, 17])
+                storage.save()
+
+            storage = Storage(os.path.join(directory, 'run-0.sdla'))
+            data = storage.load(['makespan', 'runtime', 'makespan_history'])
+            self.assertEqual((data['makespan'], data['makespan_history']), (result.makespan, [30, 20, 17]))
+            self.assertNotIn('schedule', data)
+            data = storage.load()
+            self.assertEqual(data['schedule'].to_result(lab, jobs), result)
+            self.assertEqual([job.idx for job in data['jobs']], [job.idx for job in jobs])
+
+            archive = ScheduleArchive(os.path.join(directory, 'run-1.sdla'))
+            self.assertEqual(archive.machine(2)['start'].tolist(), [s.start_time for s in result.machine_schedules[2]])
+            scanned = scan_archives([os.path.join(directory, '*.sdla')], ['makespan'])
+            self.assertEqual(scanned['makespan'].tolist(), [result.makespan + i for i in range(3)])
+
+
+class AsyncStorageWriterTestCase(unittest.TestCase):
+    def test_writes_in_background(self):
+        lab, jobs, machines, durations, operations = smallSDLInPaper()
+        result = grasp.solve(lab, jobs)
+        with tempfile.TemporaryDirectory() as directory:
+            results = ResultsStore(os.path.join(directory, 'results.db'), batch_size=4)
+            with AsyncStorageWriter(maxsize=2) as writer:
+                for i in range(10):
+                    storage = Storage(os.path.join(directory, f'run-{i}.sdla'), results=results, writer=writer)
+                    storage.set_meta_data(1, 3, 3, 4, 3, 3, i, algorithm_name='grasp')
+                    storage.set_data(lab, jobs, result, result.makespan, 0.1)
+                    storage.save()
+                self.assertLessEqual(writer.stats['max_depth'], 2)
+            self.assertEqual(writer.stats['written'], 10)
+            self.assertEqual(results.read(['index'])['index'].tolist(), list(range(10)))
+            self.assertEqual(Storage(os.path.join(directory, 'run-9.sdla')).load(['makespan'])['makespan'],
+                             result.makespan)
+
+    def test_errors_are_raised_on_close(self):
+        writer = AsyncStorageWriter()
+        storage = Storage(os.path.join(tempfile.gettempdir(), 'missing-directory', 'run.pkl'), writer=writer)
+        storage.data = {'makespan': 1, 'runtime': 0.1}
+        storage.save()
+        with self.assertRaises(FileNotFoundError):
+            writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()